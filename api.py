@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import SimpleHTTPRequestHandler
 import json
+import os
 from urllib.parse import urlparse
 from fetch_standings import fetch_nfl_standings
+from standings_cache import StandingsCache
+from team_record import StandingsEncoder
+from threaded_server import make_server
+
+standings_cache = StandingsCache({'nfl': fetch_nfl_standings})
 
 class NFLHandler(SimpleHTTPRequestHandler):
     def end_headers(self):
@@ -21,9 +27,9 @@ class NFLHandler(SimpleHTTPRequestHandler):
             self.send_header('Content-type', 'application/json')
             self.end_headers()
             
-            standings = fetch_nfl_standings()
+            standings = standings_cache.get('nfl')
             if standings:
-                self.wfile.write(json.dumps(standings).encode())
+                self.wfile.write(json.dumps(standings, cls=StandingsEncoder).encode())
             else:
                 self.wfile.write(json.dumps({'error': 'Failed to fetch standings'}).encode())
         else:
@@ -36,6 +42,7 @@ class NFLHandler(SimpleHTTPRequestHandler):
 
 if __name__ == '__main__':
     port = 8000
-    server = HTTPServer(('0.0.0.0', port), NFLHandler)
-    print(f'Server running on port {port}...')
+    workers = int(os.environ.get('WORKERS', 16))
+    server = make_server(('0.0.0.0', port), NFLHandler, workers)
+    print(f'Server running on port {port} with {workers or 1} worker(s)...')
     server.serve_forever()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of per-line classification on a large synthetic page.
+
+Usage: python3 bench_classify.py [--lines N]
+
+Builds N lines (default 100k) of NFL-style headers, team rows, seeded and
+eliminated rows and filler, then classifies each line the way the scrapers
+used to (an if/elif chain of substring tests plus inline re.search patterns)
+and with the engine's LineClassifier (one header dict lookup plus
+precompiled patterns). Prints the cost per line of each.
+"""
+import argparse
+import random
+import re
+import time
+
+from leagues import get_league, NFL_TEAMS
+from standings_engine import classifier_for
+
+DIVISION_CHAIN = [
+    ('AFC East:', ('AFC', 'East')), ('AFC North:', ('AFC', 'North')),
+    ('AFC South:', ('AFC', 'South')), ('AFC West:', ('AFC', 'West')),
+    ('NFC East:', ('NFC', 'East')), ('NFC North:', ('NFC', 'North')),
+    ('NFC South:', ('NFC', 'South')), ('NFC West:', ('NFC', 'West')),
+]
+
+def synthetic_lines(count, seed=2025):
+    rng = random.Random(seed)
+    abbrs = list(NFL_TEAMS)
+    headers = [prefix + '          W  L  T   PCT' for prefix, _ in DIVISION_CHAIN]
+    headers += ['American Football Conference:', 'National Football Conference:', 'NFL:',
+                'Division Leaders:', 'Wild Card:']
+    lines = []
+    for _ in range(count):
+        roll = rng.random()
+        abbr = rng.choice(abbrs)
+        w = rng.randint(0, 17)
+        l = rng.randint(0, 17 - w)
+        if roll < 0.05:
+            lines.append(rng.choice(headers))
+        elif roll < 0.70:
+            lines.append(f'{abbr}  {w:>3} {l:>2}  0  .{rng.randint(0, 999):03d}')
+        elif roll < 0.85:
+            lines.append(f'{rng.randint(1, 7)}:{abbr}  {w:>3} {l:>2}  0')
+        elif roll < 0.92:
+            lines.append(f'{abbr}-e  {w:>3} {l:>2}  0')
+        else:
+            lines.append(rng.choice(['', '================================', '2025 NFL Standings',
+                                     'plaintextsports.com / nfl / 2025 / standings']))
+    return lines
+
+def classify_legacy(lines):
+    hits = 0
+    for text in lines:
+        for needle, _ in DIVISION_CHAIN:
+            if needle in text:
+                hits += 1
+                break
+        else:
+            if ('American Football Conference' in text or 'National Football Conference' in text
+                    or text == 'NFL:' or 'Division Leaders:' in text or 'Wild Card:' in text):
+                hits += 1
+            elif re.search(r'^([A-Z]{2,3})(?:-[a-z])?\s+(\d+)\s+(\d+)\s+(\d+)', text):
+                hits += 1
+            elif re.search(r'^(\d+):([A-Z]{2,3})\s+(\d+)\s+(\d+)\s+(\d+)', text):
+                hits += 1
+            elif re.search(r'^([A-Z]{2,3})-e\s+(\d+)\s+(\d+)\s+(\d+)', text):
+                hits += 1
+    return hits
+
+def classify_engine(lines):
+    classifier = classifier_for(get_league('nfl'))
+    header, team, seed, eliminated = classifier.header, classifier.team, classifier.seed, classifier.eliminated
+    hits = 0
+    for text in lines:
+        if header(text) or team(text) or seed(text) or eliminated(text):
+            hits += 1
+    return hits
+
+def timed(func, lines):
+    start = time.perf_counter()
+    hits = func(lines)
+    return hits, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=100_000)
+    args = parser.parse_args()
+
+    lines = synthetic_lines(args.lines)
+    legacy_hits, legacy = timed(classify_legacy, lines)
+    engine_hits, engine = timed(classify_engine, lines)
+    if legacy_hits != engine_hits:
+        raise SystemExit(f'classifiers disagree: {legacy_hits} vs {engine_hits} lines matched')
+    per_line = 1e9 / len(lines)
+    print(f'{len(lines)} lines, {engine_hits} classified')
+    print(f'substring chain + re.search: {legacy * per_line:7.0f} ns/line')
+    print(f'LineClassifier:              {engine * per_line:7.0f} ns/line ({legacy / engine:.1f}x faster)')
+
+if __name__ == '__main__':
+    main()
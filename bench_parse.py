@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Compare the single-pass tokenizer against the old per-view div scans.
+
+Usage: python3 bench_parse.py [--nest N] [--runs N]
+
+Parses the saved pages in fixtures/ both ways and prints the time per parse.
+--nest wraps the page body in N extra divs to show how the old scans degrade
+with nesting depth.
+"""
+import argparse
+import os
+import time
+from bs4 import BeautifulSoup
+
+import fetch_standings
+import fetch_nba_standings
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LEAGUES = [
+    ('nfl', 'nfl_standings.html', fetch_standings),
+    ('nba', 'nba_standings.html', fetch_nba_standings),
+]
+VIEWS = ['parse_division_view', 'parse_conference_view', 'parse_league_view', 'parse_playoffs_view']
+
+def legacy_tokens(module, soup):
+    """One full find_all('div') + get_text() scan, as each view used to do"""
+    return [(module.SECTION_HEADERS.get(text.partition(':')[0]), text)
+            for text in (element.get_text().strip() for element in soup.find_all('div'))]
+
+def parse_legacy(module, soup):
+    return [getattr(module, view)(legacy_tokens(module, soup)) for view in VIEWS]
+
+def parse_single_pass(module, soup):
+    tokens = module.tokenize(soup)
+    return [getattr(module, view)(tokens) for view in VIEWS]
+
+def load_page(filename, nest):
+    with open(os.path.join(FIXTURES, filename)) as f:
+        html = f.read()
+    if nest:
+        html = html.replace('<body>', '<body>' + '<div>' * nest).replace('</body>', '</div>' * nest + '</body>')
+    return BeautifulSoup(html, 'html.parser')
+
+def best_time(func, runs):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nest', type=int, default=0, help='extra wrapper divs around the page body')
+    parser.add_argument('--runs', type=int, default=20, help='timed runs per parser (best is reported)')
+    args = parser.parse_args()
+
+    for league, filename, module in LEAGUES:
+        soup = load_page(filename, args.nest)
+        legacy = best_time(lambda: parse_legacy(module, soup), args.runs)
+        single = best_time(lambda: parse_single_pass(module, soup), args.runs)
+        print(f"{league.upper()}: {len(soup.find_all('div'))} divs, "
+              f"4 scans {legacy * 1000:.2f} ms, single pass {single * 1000:.2f} ms "
+              f"({legacy / single:.1f}x faster)")
+
+if __name__ == '__main__':
+    main()
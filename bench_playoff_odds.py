@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Latency check for the Monte Carlo playoff-odds engine.
+
+Usage: python3 bench_playoff_odds.py [--sims N] [--runs N] [--budget SECONDS]
+
+Parses the saved NFL and NBA pages in fixtures/, then times playoff_odds()
+for N simulated seasons (default 100k) per league. Prints the best of
+--runs and exits non-zero if any league is over the latency budget.
+"""
+import argparse
+import os
+import time
+
+from playoff_odds import playoff_odds
+from standings_engine import parse_standings
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sims', type=int, default=100_000)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=0.5, help='seconds allowed per league')
+    args = parser.parse_args()
+
+    over = []
+    for key in ('nfl', 'nba'):
+        with open(os.path.join(FIXTURES, f'{key}_standings.html'), encoding='utf-8') as f:
+            data = parse_standings(key, f.read())
+        best = float('inf')
+        for run in range(args.runs):
+            start = time.perf_counter()
+            playoff_odds(key, data, args.sims, seed=run)
+            best = min(best, time.perf_counter() - start)
+        status = 'ok' if best <= args.budget else 'OVER BUDGET'
+        print(f'{key}: {args.sims} seasons in {best * 1000:7.1f} ms '
+              f'({best / args.sims * 1e6:.2f} us/season, budget {args.budget * 1000:.0f} ms) {status}')
+        if best > args.budget:
+            over.append(key)
+    if over:
+        raise SystemExit(f"over latency budget: {', '.join(over)}")
+
+if __name__ == '__main__':
+    main()
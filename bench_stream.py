@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Peak memory and time of the tree parse vs. the streaming parse.
+
+Usage: python3 bench_stream.py [--scale N] [--chunk BYTES]
+
+Repeats the rows of each saved page in fixtures/ N times (default 20) to
+stand in for a large page, then tokenizes it the buffered way (whole text,
+BeautifulSoup tree, extract_lines) and the streaming way (chunks fed to
+DivLineParser as they would arrive from iter_content). Prints time and
+tracemalloc peak for each; both must yield the same lines.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from standings_engine import DivLineParser, extract_lines
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def scaled_page(filename, scale):
+    with open(os.path.join(FIXTURES, filename), encoding='utf-8') as f:
+        html = f.read()
+    head, sep, rest = html.partition('<body>')
+    body, end, tail = rest.rpartition('</body>')
+    return head + sep + body * scale + end + tail
+
+def tree_lines(chunks):
+    return extract_lines(BeautifulSoup(''.join(chunks), 'html.parser'))
+
+def stream_lines(chunks):
+    lines = []
+    parser = DivLineParser(lines.append)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return lines
+
+def measure(func, chunks):
+    tracemalloc.start()
+    start = time.perf_counter()
+    lines = func(chunks)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return lines, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=20)
+    parser.add_argument('--chunk', type=int, default=16 * 1024)
+    args = parser.parse_args()
+
+    for filename in ('nfl_standings.html', 'nba_standings.html'):
+        html = scaled_page(filename, args.scale)
+        # A generator, like iter_content: only one chunk is alive at a time
+        make_chunks = lambda: (html[i:i + args.chunk] for i in range(0, len(html), args.chunk))
+        tree, tree_time, tree_peak = measure(tree_lines, make_chunks())
+        stream, stream_time, stream_peak = measure(stream_lines, make_chunks())
+        if tree != stream:
+            raise SystemExit(f'{filename}: streaming parse produced different lines')
+        print(f'{filename} x{args.scale} ({len(html) / 1024:.0f} KiB, {len(tree)} lines)')
+        print(f'  BeautifulSoup tree: {tree_time * 1000:7.1f} ms, peak {tree_peak / 1024:7.0f} KiB')
+        print(f'  DivLineParser:      {stream_time * 1000:7.1f} ms, peak {stream_peak / 1024:7.0f} KiB')
+
+if __name__ == '__main__':
+    main()
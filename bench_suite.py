@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Offline benchmark suite for the NFL and NBA scrapers, with a regression gate.
+
+Usage: python3 bench_suite.py [--runs N] [--min-time S] [--rows N] [--nest N]
+                              [--tolerance F] [--retries N] [--update-baseline]
+
+Every case runs against recorded pages in fixtures/ and a local stub server;
+nothing touches plaintextsports.com. For each league it times, on the
+recorded page and on two synthetic pages (each team row repeated --rows
+times, and the body wrapped in --nest extra divs):
+
+  tokenize             BeautifulSoup + extract_lines + classification
+  parse_*_view         each view parser over the token stream
+  parse_*_standings    the whole raw-page parse
+
+and end to end, fetch_nfl_standings / fetch_nba_standings against the stub
+server, in both the buffered and the streaming (STREAM_PARSE) mode.
+
+Each timed sample calls a case in a loop for at least --min-time (default
+50 ms), so even sub-millisecond cases are timed over many calls, and
+follows a sample of a fixed stdlib-only calibration workload. Reports the
+best per-call time, throughput and tracemalloc peak of each case, and its median
+time relative to the calibration sample before it, which cancels out the
+machine's speed and most of its load.
+
+The relative times and peaks are compared with bench_baseline.json. The run
+fails if a case is more than --tolerance (default 0.5, i.e. 50%) slower or
+bigger than its baseline, and still is when re-measured (--retries, default
+2). The baseline is per machine and not committed: record one with
+--update-baseline before changing the code; without one nothing is gated.
+"""
+import argparse
+import contextlib
+import functools
+import gc
+import io
+import json
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bs4 import BeautifulSoup
+
+import fetch_nba_standings
+import fetch_standings
+import standings_engine
+import upstream
+from leagues import get_league
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+LEAGUES = [
+    ('nfl', 'nfl_standings.html', fetch_standings, fetch_standings.fetch_nfl_standings,
+     fetch_standings.parse_nfl_standings),
+    ('nba', 'nba_standings.html', fetch_nba_standings, fetch_nba_standings.fetch_nba_standings,
+     fetch_nba_standings.parse_nba_standings),
+]
+# Shortest timed sample; sub-millisecond cases are looped up to this, so that
+# timer resolution and scheduler noise do not trip the regression gate
+MIN_SAMPLE_TIME = 0.05
+# Metrics the gate compares; absolute seconds are reported but depend on the machine
+GATED = ('relative', 'peak_bytes')
+VIEWS = ['parse_division_view', 'parse_conference_view', 'parse_league_view', 'parse_playoffs_view']
+
+def recorded_page(filename):
+    with open(os.path.join(FIXTURES, filename), encoding='utf-8') as f:
+        return f.read()
+
+def repeat_rows(html, rows):
+    """Repeat every team row line, as on a page with many more rows per section"""
+    return '\n'.join(line if 'class="row"' not in line else '\n'.join([line] * rows)
+                     for line in html.split('\n'))
+
+def nest_body(html, nest):
+    """Wrap the page body in nest extra divs"""
+    return html.replace('<body>', '<body>' + '<div>' * nest).replace('</body>', '</div>' * nest + '</body>')
+
+def quiet(func):
+    """func with its stdout discarded (fetch_* print progress lines)"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return run
+
+class Calibration:
+    """Fixed work that case timings are expressed in units of.
+
+    Tokenizes the recorded NFL page with the stdlib HTMLParser and splits
+    its text into lines, which exercises the interpreter much like the
+    cases do but runs none of the code under test.
+    """
+
+    def __init__(self):
+        self.html = recorded_page('nfl_standings.html')
+
+    def __call__(self):
+        lines = []
+        parser = HTMLParser()
+        parser.handle_data = lambda data: lines.extend(line.strip() for line in data.split('\n'))
+        parser.feed(self.html)
+        parser.close()
+        return lines
+
+def time_case(func, reference, runs, min_time=MIN_SAMPLE_TIME):
+    """(best per-call time of func, its median ratio to reference) over runs sample pairs.
+
+    Every sample calls its function in a loop for at least min_time, and
+    each func sample directly follows a reference sample, so a slowdown hits
+    both sides of a ratio. Like timeit, the garbage collector is off while
+    timing, so a collection triggered by whatever earlier cases left on the
+    heap is not billed here.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        loops = _loops(func, min_time)
+        reference_loops = _loops(reference, min_time)
+        times, ratios = [], []
+        for _ in range(runs):
+            reference_time = _sample(reference, reference_loops)
+            times.append(_sample(func, loops))
+            ratios.append(times[-1] / reference_time)
+        return min(times), statistics.median(ratios)
+    finally:
+        gc.enable()
+
+def _sample(func, loops):
+    start = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return (time.perf_counter() - start) / loops
+
+def _loops(func, min_time):
+    # Calls per sample for one to last at least min_time
+    loops = 1
+    while _sample(func, loops) * loops < min_time:
+        loops *= 2
+    return loops
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+class StubServer:
+    """Serves fixed pages on 127.0.0.1 in place of plaintextsports.com"""
+
+    def __init__(self):
+        self.pages = {}
+        pages = self.pages
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = pages.get(self.path)
+                self.send_response(200 if body else 404)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body or b'')))
+                self.end_headers()
+                self.wfile.write(body or b'')
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def url(self, path, html):
+        self.pages[path] = html.encode('utf-8')
+        return f'http://127.0.0.1:{self.server.server_address[1]}{path}'
+
+def fetch_from(fetch, league, url, streaming):
+    """fetch() against url in buffered or streaming mode, restoring the league config afterwards"""
+    original_url, original_mode = league['url'], standings_engine.STREAM_PARSE
+    league['url'], standings_engine.STREAM_PARSE = url, streaming
+    try:
+        return fetch()
+    finally:
+        league['url'], standings_engine.STREAM_PARSE = original_url, original_mode
+
+def build_cases(args, stub):
+    """[(name, func, input size in bytes)] for every case in the suite"""
+    cases = []
+    for key, filename, module, fetch, parse in LEAGUES:
+        base = recorded_page(filename)
+        pages = [('recorded', base), (f'rows{args.rows}', repeat_rows(base, args.rows)),
+                 (f'nest{args.nest}', nest_body(base, args.nest))]
+        for label, html in pages:
+            prefix = f'{key}/{label}'
+            size = len(html.encode('utf-8'))
+            tokens = module.tokenize(BeautifulSoup(html, 'html.parser'))
+            cases.append((f'{prefix}/tokenize',
+                          lambda module=module, html=html: module.tokenize(BeautifulSoup(html, 'html.parser')), size))
+            for view in VIEWS:
+                cases.append((f'{prefix}/{view}', functools.partial(getattr(module, view), tokens), size))
+            cases.append((f'{prefix}/{parse.__name__}', functools.partial(parse, html), size))
+
+        url = stub.url(f'/{key}/standings', base)
+        for mode, streaming in (('buffered', False), ('stream', True)):
+            func = functools.partial(fetch_from, quiet(fetch), get_league(key), url, streaming)
+            if func() is None:
+                raise SystemExit(f'{fetch.__name__} failed against the stub server')
+            cases.append((f'{key}/e2e/{fetch.__name__}/{mode}', func, len(base.encode('utf-8'))))
+    return cases
+
+def run_cases(args, cases, calibration):
+    results = {}
+    for name, func, size in cases:
+        seconds, relative = time_case(func, calibration, args.runs, args.min_time)
+        results[name] = {'seconds': seconds, 'relative': relative, 'peak_bytes': peak_memory(func)}
+        print(f'{name:<40} {seconds * 1000:9.2f} ms {results[name]["relative"]:8.3f}x cal '
+              f'{size / 1024 / seconds:9.0f} KiB/s {results[name]["peak_bytes"] / 1024:8.0f} KiB peak')
+    return results
+
+def compare(results, baseline, tolerance):
+    """[(case name, description)] of every metric over its baseline by more than tolerance"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in GATED:
+            if metric in previous and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append((name, f'{name} {metric}: {previous[metric]:.6g} -> {current[metric]:.6g} '
+                                          f'({current[metric] / previous[metric]:.2f}x)'))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='timed runs per case (best is reported)')
+    parser.add_argument('--min-time', type=float, default=MIN_SAMPLE_TIME,
+                        help='seconds each timed sample loops a case for (per-call time is reported)')
+    parser.add_argument('--rows', type=int, default=25, help='repeats of each team row on the synthetic page')
+    parser.add_argument('--nest', type=int, default=50, help='extra wrapper divs on the synthetic page')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed slowdown / growth vs. baseline')
+    parser.add_argument('--retries', type=int, default=2, help='re-measurements of cases over the limit')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--update-baseline', action='store_true', help='store this run as the new baseline')
+    args = parser.parse_args()
+
+    stub = StubServer()
+    # The suite measures parsing, not disk writes
+    upstream.SNAPSHOT_DIR = ''
+    try:
+        run(args, build_cases(args, stub), Calibration())
+    finally:
+        stub.server.shutdown()
+
+def run(args, cases, calibration):
+    results = run_cases(args, cases, calibration)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'Baseline written to {args.baseline}')
+        return
+    if not os.path.exists(args.baseline):
+        print('No baseline yet; run with --update-baseline to record one')
+        return
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    # Timings on a shared machine have bursts of noise: a case only counts as
+    # regressed if it stays over the limit when measured again
+    for _ in range(args.retries):
+        if not regressions:
+            break
+        names = {name for name, _ in regressions}
+        print(f"Re-measuring {len(names)} case(s) over the limit...")
+        retried = run_cases(args, [case for case in cases if case[0] in names], calibration)
+        for name, result in retried.items():
+            for metric in GATED:
+                results[name][metric] = min(results[name][metric], result[metric])
+        regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        raise SystemExit('Regressions against baseline:\n  ' + '\n  '.join(text for _, text in regressions))
+    print(f'No regressions against baseline (tolerance {args.tolerance:.0%})')
+
+if __name__ == '__main__':
+    main()
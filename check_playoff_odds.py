@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Sanity check of playoff odds on the recorded standings pages.
+
+Usage: python3 check_playoff_odds.py [--sims N]
+
+Parses the saved NFL and NBA pages in fixtures/ and simulates N seasons
+(default 10k) per league. In every conference the current 1 seed must have
+the best playoff odds, ahead of the lowest current seed, and the odds must
+not change when the standings come from JSON (shared snapshots, saved
+copies) instead of a fresh parse. Exits non-zero on the first failure.
+"""
+import argparse
+import json
+import os
+
+from playoff_odds import playoff_odds
+from standings_engine import parse_standings
+from team_record import StandingsEncoder
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sims', type=int, default=10_000)
+    args = parser.parse_args()
+
+    for key in ('nfl', 'nba'):
+        with open(os.path.join(FIXTURES, f'{key}_standings.html'), encoding='utf-8') as f:
+            data = parse_standings(key, f.read())
+        odds = playoff_odds(key, data, args.sims, seed=1)
+        if playoff_odds(key, json.loads(json.dumps(data, cls=StandingsEncoder)), args.sims, seed=1) != odds:
+            raise SystemExit(f'{key.upper()}: odds differ between parsed and JSON standings')
+        for conf, sections in data['playoffs'].items():
+            seeded = sorted(sections['division_leaders'] + sections['wild_card'], key=lambda team: team.seed)
+            by_abbr = {entry['abbr']: entry['playoffs'] for entry in odds['conferences'][conf]}
+            top, bottom = seeded[0], seeded[-1]
+            best = max(by_abbr.values())
+            if by_abbr[top.abbr] < best or by_abbr[top.abbr] <= by_abbr[bottom.abbr]:
+                raise SystemExit(f'{key.upper()} {conf}: 1 seed {top.abbr} has playoff odds {by_abbr[top.abbr]}, '
+                                 f'{bottom.seed} seed {bottom.abbr} {by_abbr[bottom.abbr]}, best team {best}')
+            print(f'{key.upper()} {conf}: 1 seed {top.abbr} {by_abbr[top.abbr]:.3f}, '
+                  f'{bottom.seed} seed {bottom.abbr} {by_abbr[bottom.abbr]:.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Randomized check that incremental re-ranking matches a full sort.
+
+Usage: python3 check_ranking.py [--refreshes N] [--seed S]
+
+Feeds N refreshes (default 2000) of random records through a
+ranking.Ranking for each of a few grouping sizes: most change a few teams'
+records, some change most of them, and some swap a team out. After every refresh the
+ranking must equal sorted(teams, key=sort_key); exits non-zero on the first
+mismatch and otherwise prints how many refreshes took the incremental path.
+"""
+import argparse
+import random
+
+from ranking import Ranking, sort_key
+from team_record import TeamRecord
+
+# NFL division, NBA conference, NFL conference, NFL league
+GROUP_SIZES = (4, 15, 16, 32)
+
+
+def random_record(rng, abbr, ties):
+    # Narrow ranges so many teams share a W-L and only the later key fields separate them
+    wins = rng.randint(0, 6)
+    losses = rng.randint(0, 6)
+    return TeamRecord(f'Team {abbr}', abbr, wins, losses, rng.randint(0, 2) if ties else None)
+
+
+def refresh(rng, teams, ties, spare):
+    """New records for the grouping: a few, most or one swapped-out team changed"""
+    teams = list(teams)
+    roll = rng.random()
+    if roll < 0.05 and spare:
+        index = rng.randrange(len(teams))
+        teams[index], spare[0] = random_record(rng, spare[0], ties), teams[index].abbr
+    else:
+        count = rng.randint(len(teams) // 2 + 1, len(teams)) if roll < 0.2 else rng.randint(0, 3)
+        for index in rng.sample(range(len(teams)), min(count, len(teams))):
+            teams[index] = random_record(rng, teams[index].abbr, ties)
+    rng.shuffle(teams)
+    return teams
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--refreshes', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=2025)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    incremental = 0
+    for size in GROUP_SIZES:
+        # Even sizes are NFL groupings with ties, odd ones NBA groupings without
+        ties = size % 2 == 0
+        teams = [random_record(rng, f'T{i:02d}', ties) for i in range(size)]
+        spare = [f'X{size:02d}']
+        ranking = Ranking(teams)
+        for index in range(args.refreshes // len(GROUP_SIZES)):
+            teams = refresh(rng, teams, ties, spare)
+            incremental += ranking.update(teams)
+            expected = sorted(teams, key=sort_key)
+            if ranking.teams != expected or ranking.keys != [team.sort_key for team in expected]:
+                raise SystemExit(f'Refresh {index} of {size} teams: got {ranking.teams}, expected {expected}')
+
+    print(f'{args.refreshes} refreshes match a full sort ({incremental} incremental)')
+
+
+if __name__ == '__main__':
+    main()
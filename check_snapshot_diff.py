@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Randomized round-trip check of the standings deltas sent to clients.
+
+Usage: python3 check_snapshot_diff.py [--rounds N] [--seed S]
+
+Starts from the recorded NFL and NBA pages in fixtures/ and applies N
+random refreshes per league (default 500): record changes, reordered
+leaves, teams moving between playoff sections and refreshes that change
+nothing. Each time diff_standings(old, new) is sent through JSON and applied
+to old the way applyStandingsDelta in combined_script.js does; the result
+must equal new. Exits non-zero on the first mismatch.
+"""
+import argparse
+import copy
+import json
+import os
+import random
+
+from snapshot_diff import diff_standings
+from standings_engine import parse_standings
+from team_record import StandingsEncoder
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+PAGES = {'nfl': 'nfl_standings.html', 'nba': 'nba_standings.html'}
+
+
+def as_json(data):
+    """What a client holds: the standings after a trip through JSON"""
+    return json.loads(json.dumps(data, cls=StandingsEncoder))
+
+
+def leaves(data):
+    # Every team list in a payload, so they can be mutated in place
+    if isinstance(data, dict):
+        for value in data.values():
+            yield from leaves(value)
+    else:
+        yield data
+
+
+def apply_delta(data, changes):
+    """Python port of applyStandingsDelta in combined_script.js"""
+    result = copy.deepcopy(data)
+    for change in changes:
+        if result.get(change['path'][0]) is None:
+            continue
+        parent = result
+        for key in change['path'][:-1]:
+            parent = parent.setdefault(key, {})
+        key = change['path'][-1]
+        old_teams = parent.get(key) or []
+        by_abbr = {team['abbr']: team for team in old_teams}
+        by_abbr.update((team['abbr'], team) for team in change['teams'])
+        order = change['order'] if 'order' in change else [team['abbr'] for team in old_teams]
+        parent[key] = [by_abbr[abbr] for abbr in order]
+    return result
+
+
+def refresh(rng, data):
+    """A copy of data with a random mix of the changes a real refresh brings"""
+    data = as_json(data)
+    team_lists = list(leaves(data))
+    roll = rng.random()
+    if roll < 0.1:
+        return data
+    # New records for a few teams, updated everywhere the team is listed
+    abbrs = sorted({team['abbr'] for teams in team_lists for team in teams})
+    for abbr in rng.sample(abbrs, rng.randint(1, 4)):
+        wins, losses = rng.randint(0, 17), rng.randint(0, 17)
+        ties = rng.randint(0, 1)
+        for team in (team for teams in team_lists for team in teams if team['abbr'] == abbr):
+            team.update(wins=wins, losses=losses)
+            if 'ties' in team:
+                team['ties'] = ties
+    if roll < 0.6:
+        # Reordered leaves: a single swap or a full shuffle
+        for teams in rng.sample(team_lists, rng.randint(1, 3)):
+            if len(teams) > 1 and rng.random() < 0.5:
+                i, j = rng.sample(range(len(teams)), 2)
+                teams[i], teams[j] = teams[j], teams[i]
+            else:
+                rng.shuffle(teams)
+    if roll > 0.5:
+        # A team moves between playoff sections (clinches, drops out or changes seed)
+        sections = list(leaves(data['playoffs']))
+        source, target = rng.choice([s for s in sections if s]), rng.choice(sections)
+        team = source.pop(rng.randrange(len(source)))
+        if 'seed' in team:
+            team['seed'] = rng.randint(1, 10)
+        # A section lists a team once; if it is already there the move is just a removal
+        if not any(other['abbr'] == team['abbr'] for other in target):
+            target.insert(rng.randint(0, len(target)), team)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=2025)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for key, filename in PAGES.items():
+        with open(os.path.join(FIXTURES, filename), encoding='utf-8') as f:
+            # The first round diffs the parsed TeamRecords, as the server does
+            old = parse_standings(key, f.read())
+        changed = 0
+        for index in range(args.rounds):
+            new = refresh(rng, old)
+            changes = json.loads(json.dumps(diff_standings(old, new)))
+            changed += bool(changes)
+            if apply_delta(as_json(old), changes) != new:
+                raise SystemExit(f'{key.upper()} round {index}: applying {changes} does not give the new standings')
+            old = new
+        print(f'{key.upper()}: {args.rounds} deltas round-trip ({changed} non-empty)')
+
+
+if __name__ == '__main__':
+    main()
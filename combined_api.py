@@ -1,100 +1,599 @@
 #!/usr/bin/env python3
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import time
+# Taken before the remaining imports so the reported startup time includes them
+STARTED = time.perf_counter()
+
+from http.server import SimpleHTTPRequestHandler
 import json
-import sys
+import functools
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import urlparse, parse_qs
+from history_store import HistoryStore, HISTORY_DB
+import last_known_good
+from leagues import LEAGUES
+import metrics
+from prefetch import Prefetcher
+from rate_limit import TokenBucketLimiter
+from standings_cache import FETCH_WAIT_TIMEOUT, STANDINGS_TTL, Snapshot, StandingsCache, encode, etag_for
+from static_assets import StaticAssets
+from stream_hub import StreamHub, RETRY_MS
+from team_record import StandingsEncoder
+from threaded_server import make_server
+
+# Optional ProcessPoolExecutor for parsing, set up when PARSE_PROCESSES > 0
+parse_pool = None
+
+def fetch_league(key):
+    # Imported lazily so the server starts without loading the scraper stack
+    import standings_engine
+    return standings_engine.fetch_standings(key, parse_pool)
+
+logger = logging.getLogger('combined_api')
+
+# Compressed encodings we keep for snapshots, in order of preference
+ENCODINGS = ('gzip', 'deflate')
+
+def negotiate_encoding(accept_encoding):
+    """Pick a Content-Encoding from an Accept-Encoding header value"""
+    if not accept_encoding:
+        return 'identity'
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        params = params.strip()
+        try:
+            q = float(params[2:]) if params.startswith('q=') else 1.0
+        except ValueError:
+            q = 0.0
+        weights[coding.strip().lower()] = q
+    best, best_q = 'identity', 0.0
+    for coding in ENCODINGS:
+        q = weights.get(coding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+# One cache entry (and /api/standings/<key> route) per registered league;
+# shared by every handler instance, see STANDINGS_TTL for the refresh interval
+standings_cache = StandingsCache({key: functools.partial(fetch_league, key) for key in LEAGUES})
+
+# Pushes snapshot changes to /api/standings/<key>/stream subscribers
+stream_hub = StreamHub(standings_cache)
 
-# Add paths for both scrapers
-sys.path.insert(0, '/workspaces/nfl')
-sys.path.insert(0, '/workspaces/nba')
+# Warms every league at startup and refreshes each on its own adaptive schedule
+prefetcher = Prefetcher(standings_cache)
+
+# SQLite standings history, opened at startup unless HISTORY_DB is empty
+history_store = None
+
+STANDINGS_PREFIX = '/api/standings/'
+# Several leagues in one response: /api/standings?leagues=nfl,nba[&views=division,...]
+BATCH_PATH = '/api/standings'
+# Views served on their own as /api/standings/<league>/<view>
+VIEWS = ('division', 'conference', 'league', 'playoffs')
+HISTORY_PREFIX = '/api/history/'
+ODDS_PREFIX = '/api/playoff-odds/'
+
+# league -> (etag, simulations, odds) for the latest playoff-odds run
+playoff_odds_cache = {}
+
+# (leagues, views) -> (etag and restored flag of each league, Snapshot) for the latest batched response
+batch_cache = {}
+
+def batch_snapshot(leagues, views, snapshots):
+    """Combine several leagues' snapshots (or some of their views) into one Snapshot.
+
+    The body is spliced together from the already-serialized bodies, and the
+    result is reused until one of the leagues changes.
+    """
+    key = tuple((snapshot.etag, snapshot.restored) if snapshot else None for snapshot in snapshots)
+    cached = batch_cache.get((leagues, views))
+    if cached and cached[0] == key:
+        return cached[1]
+    parts = []
+    for league, snapshot in zip(leagues, snapshots):
+        if snapshot is None:
+            entry = json.dumps({'error': f"Failed to fetch {LEAGUES[league]['name']} data"}).encode()
+        else:
+            if views:
+                standings = b'{' + b','.join(b'"%s":' % view.encode() + snapshot.view(view).body
+                                             for view in views) + b'}'
+            else:
+                standings = snapshot.body
+            entry = (b'{"version":%d,"restored":%s,"standings":' % (snapshot.version, b'true' if snapshot.restored else b'false')
+                     + standings + b'}')
+        parts.append(b'"%s":' % league.encode() + entry)
+    body = b'{' + b','.join(parts) + b'}'
+    live = [snapshot for snapshot in snapshots if snapshot]
+    batch = Snapshot.from_encoded(None, encode(body), etag_for(body),
+                                  max((snapshot.last_modified for snapshot in live), default=time.time()),
+                                  max((snapshot.version for snapshot in live), default=0))
+    batch_cache[leagues, views] = (key, batch)
+    return batch
+
+def parse_time(value, end_of_day=False):
+    """Parse unix seconds, an ISO date or an ISO datetime (UTC unless given) into unix seconds.
+
+    A bare date means its start, or its end with end_of_day. Returns None if unparseable.
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    if end_of_day and len(value) == 10:
+        moment += timedelta(days=1, microseconds=-1)
+    return moment.timestamp()
+
+REQUEST_SECONDS = metrics.Histogram('http_request_duration_seconds', 'Request latency by route and status',
+                                    ('route', 'status'))
+metrics.Gauge('standings_snapshot_age_seconds', 'Seconds since each league was last fetched successfully',
+              ('league',), lambda: {(key,): standings_cache.age(key) for key in LEAGUES
+                                    if standings_cache.age(key) is not None})
+metrics.Gauge('standings_refresh_interval_seconds', 'Current scheduled refresh interval per league',
+              ('league',), lambda: {(key,): policy.interval() for key, policy in prefetcher.policies.items()})
+metrics.Gauge('standings_stream_subscribers', 'Open Server-Sent Events streams per league',
+              ('league',), lambda: {(key,): stream_hub.subscriber_count(key) for key in LEAGUES})
+
+# Front-end files, served from memory under fingerprinted URLs
+static_assets = StaticAssets()
+
+# ?refresh=1 scrapes upstream at most once per this many seconds, however many clients ask
+FORCE_REFRESH_WINDOW = float(os.environ.get('FORCE_REFRESH_WINDOW', 30))
+# Trusted proxies in front of the server; the client IP is taken from X-Forwarded-For past them
+PROXY_HOPS = int(os.environ.get('PROXY_HOPS', 0))
+rate_limiter = TokenBucketLimiter()
+RATE_LIMITED = metrics.Counter('http_rate_limited_total', 'API requests rejected by the per-client rate limit')
+# Set in multi-process mode (PROCESSES > 1)
+shared_snapshots = None
+
+# Seconds from process start until the server was ready to accept requests
+startup_seconds = None
+metrics.Gauge('standings_startup_seconds', 'Seconds from launch until the server accepted requests',
+              callback=lambda: {} if startup_seconds is None else {(): startup_seconds})
+
+# ?profile=1 runs a request under cProfile when PROFILING=1; the report is kept for /metrics/profile
+PROFILING = os.environ.get('PROFILING', '0') == '1'
+last_profile = None
+
+def route_label(path):
+    """Collapse a request path into a route for metric labels"""
+    for prefix, name in ((STANDINGS_PREFIX, '/api/standings/<league>'), (ODDS_PREFIX, '/api/playoff-odds/<league>'),
+                         (HISTORY_PREFIX, '/api/history/<league>/<abbr>')):
+        if path.startswith(prefix):
+            resource = path[len(prefix):].partition('/')[2]
+            if prefix == STANDINGS_PREFIX and resource:
+                return name + ('/stream' if resource == 'stream' else '/<view>')
+            return name
+    if path in (BATCH_PATH, '/api/ready', '/api/metrics', '/metrics', '/metrics/profile'):
+        return path
+    return 'static'
 
 class CombinedHandler(SimpleHTTPRequestHandler):
-    def get_placeholder_nba_data(self):
-        """Return placeholder NBA data structure"""
-        return {
-            'division': {
-                'Eastern': {
-                    'Atlantic': [],
-                    'Central': [],
-                    'Southeast': []
-                },
-                'Western': {
-                    'Northwest': [],
-                    'Pacific': [],
-                    'Southwest': []
-                }
-            },
-            'conference': {
-                'Eastern': [],
-                'Western': []
-            },
-            'league': [],
-            'playoffs': {
-                'Eastern': {
-                    'division_leaders': [],
-                    'wild_card': [],
-                    'eliminated': []
-                },
-                'Western': {
-                    'division_leaders': [],
-                    'wild_card': [],
-                    'eliminated': []
-                }
-            },
-            'message': 'NBA data not yet implemented. Install fetch_nba_standings.py to enable.'
-        }
-    
     def do_GET(self):
         # Redirect root and old index.html to combined_index.html
         if self.path == '/' or self.path == '/index.html':
             self.path = '/combined_index.html'
         
-        if self.path == '/api/standings/nfl':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
+        url = urlparse(self.path)
+        self.response_status = None
+        start = time.perf_counter()
+        try:
+            if PROFILING and parse_qs(url.query).get('profile') == ['1']:
+                self.profile_request(url)
+            else:
+                self.route(url)
+        finally:
+            REQUEST_SECONDS.observe(time.perf_counter() - start, route=route_label(url.path),
+                                    status=self.response_status or 'error')
+
+    def send_response(self, code, message=None):
+        self.response_status = code
+        super().send_response(code, message)
+
+    def client_ip(self):
+        """The client's address, looking past PROXY_HOPS trusted proxies"""
+        forwarded = [ip.strip() for ip in self.headers.get('X-Forwarded-For', '').split(',') if ip.strip()]
+        if PROXY_HOPS and forwarded:
+            return forwarded[-min(PROXY_HOPS, len(forwarded))]
+        return self.client_address[0]
+
+    def route(self, url):
+        path = url.path
+        if path.startswith('/api/') and path != '/api/ready':
+            retry_after = rate_limiter.allow(self.client_ip())
+            if retry_after:
+                RATE_LIMITED.inc()
+                self.send_json({'error': 'Too many requests'}, status=429,
+                               headers={'Retry-After': str(max(1, round(retry_after)))})
+                return
+        if path == '/api/ready':
+            self.send_ready()
+        elif path == '/api/metrics':
+            self.send_json(prefetcher.metrics())
+        elif path == '/metrics':
+            self.send_text(metrics.render(), 'text/plain; version=0.0.4')
+        elif path == '/metrics/profile':
+            self.send_text(last_profile or 'No profile captured; request any URL with ?profile=1 (needs PROFILING=1)\n')
+        elif path == BATCH_PATH:
+            self.send_batch(parse_qs(url.query))
+        elif path.startswith(STANDINGS_PREFIX):
+            league, _, resource = path[len(STANDINGS_PREFIX):].partition('/')
+            if resource == 'stream':
+                self.send_stream(league, parse_qs(url.query))
+            elif resource in VIEWS:
+                self.send_standings(league, parse_qs(url.query), view=resource)
+            elif resource:
+                self.send_json({'error': f'Unknown resource: {resource}'}, status=404)
+            else:
+                self.send_standings(league, parse_qs(url.query))
+        elif path.startswith(ODDS_PREFIX):
+            self.send_playoff_odds(path[len(ODDS_PREFIX):], parse_qs(url.query))
+        elif path.startswith(HISTORY_PREFIX):
+            league, _, abbr = path[len(HISTORY_PREFIX):].partition('/')
+            self.send_history(league, abbr.upper(), parse_qs(url.query))
+        elif (asset := static_assets.get(path)) is not None:
+            self.send_asset(asset)
+        else:
+            super().do_GET()
+
+    def profile_request(self, url):
+        """Serve the request under cProfile and keep the report for /metrics/profile"""
+        global last_profile
+        import cProfile
+        import io
+        import pstats
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(self.route, url)
+        finally:
+            report = io.StringIO()
+            report.write(f'Profile of GET {self.path} at {formatdate(usegmt=True)}\n\n')
+            pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(40)
+            last_profile = report.getvalue()
+
+    def send_standings(self, league, query=None, view=None):
+        if league not in standings_cache:
+            self.send_json({'error': f'Unknown league: {league}'}, status=404)
+            return
+        name = LEAGUES[league]['name']
+        query = query or {}
+        if 'at' in query and view is None:
+            self.send_standings_at(league, query['at'][0])
+            return
+        if query.get('refresh') == ['1']:
+            force_refresh(league)
+        try:
+            snapshot = standings_cache.get_snapshot(league)
+            # Dump the outgoing data only when debugging (LOG_LEVEL=DEBUG)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s API outgoing data:\n%s", name,
+                             json.dumps(snapshot.data if snapshot else None, indent=2, cls=StandingsEncoder))
+            # A snapshot restored at startup is flagged until a live fetch confirms it
+            stale_age = standings_cache.age(league) if snapshot and snapshot.restored else None
+            if snapshot and view:
+                self.send_snapshot(snapshot.view(view), stale_age=stale_age)
+            elif snapshot:
+                # ?since=<version> asks for only what changed after that version
+                since = query.get('since', [''])[0]
+                delta = standings_cache.delta(league, int(since)) if since.isdigit() else None
+                self.send_snapshot(snapshot, delta, stale_age)
+            else:
+                self.send_json({'error': f'Failed to fetch {name} data'})
+        except Exception as e:
+            print(f"{name} fetch error: {e}")
+            self.send_json({'error': str(e)})
+
+    def send_batch(self, query):
+        """Send several leagues, optionally only some views, in one response"""
+        requested = [item for value in query.get('leagues', []) for item in value.split(',') if item]
+        views = [item for value in query.get('views', []) for item in value.split(',') if item]
+        unknown = [league for league in requested if league not in standings_cache]
+        unknown += [view for view in views if view not in VIEWS]
+        if unknown:
+            self.send_json({'error': f"Unknown league or view: {', '.join(unknown)}"}, status=404)
+            return
+        # Canonical order, so equivalent queries share ETags and batch_cache entries
+        leagues = tuple(league for league in standings_cache.leagues() if not requested or league in requested)
+        views = tuple(view for view in VIEWS if view in views)
+        # Fetch leagues without a snapshot concurrently instead of one after another
+        missing = [league for league in leagues if standings_cache.peek(league) is None]
+        if len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                list(pool.map(standings_cache.get_snapshot, missing))
+        try:
+            snapshots = [standings_cache.get_snapshot(league) for league in leagues]
+            self.send_snapshot(batch_snapshot(leagues, views, snapshots))
+        except Exception as e:
+            print(f"Batched standings error: {e}")
+            self.send_json({'error': str(e)})
+
+    def send_standings_at(self, league, at):
+        """Send the standings as stored at a past date, from the history store"""
+        timestamp = parse_time(at, end_of_day=True)
+        if history_store is None:
+            self.send_json({'error': 'History is disabled'}, status=404)
+        elif timestamp is None:
+            self.send_json({'error': f'Invalid date: {at}'}, status=400)
+        else:
+            found = history_store.at(league, timestamp)
+            if found is None:
+                self.send_json({'error': f'No {league} standings stored at or before {at}'}, status=404)
+            else:
+                fetched_at, data = found
+                self.send_json({'league': league, 'fetched_at': fetched_at, 'standings': data})
+
+    def send_history(self, league, abbr, query):
+        """Send one team's record changes over time: /api/history/<league>/<abbr>[?since=&until=]"""
+        if league not in standings_cache:
+            self.send_json({'error': f'Unknown league: {league}'}, status=404)
+        elif history_store is None:
+            self.send_json({'error': 'History is disabled'}, status=404)
+        else:
+            since = parse_time(query.get('since', [''])[0])
+            until = parse_time(query.get('until', [''])[0], end_of_day=True)
+            history = history_store.team_history(league, abbr, since, until)
+            if not history and not (since or until):
+                self.send_json({'error': f'No history for {abbr}'}, status=404)
+            else:
+                self.send_json({'league': league, 'abbr': abbr, 'history': history})
+
+    def send_playoff_odds(self, league, query):
+        """Send Monte Carlo playoff odds for a league's current standings"""
+        if league not in standings_cache or 'playoff_odds' not in LEAGUES[league]:
+            self.send_json({'error': f'Unknown league: {league}'}, status=404)
+            return
+        try:
+            # NumPy is only needed for this endpoint
+            import playoff_odds
+        except ImportError:
+            self.send_json({'error': 'Playoff odds require NumPy'}, status=503)
+            return
+        sims = query.get('sims', [''])[0]
+        sims = min(int(sims), playoff_odds.MAX_SIMULATIONS) if sims.isdigit() and int(sims) > 0 \
+            else playoff_odds.DEFAULT_SIMULATIONS
+        snapshot = standings_cache.get_snapshot(league)
+        if not snapshot:
+            self.send_json({'error': f"Failed to fetch {LEAGUES[league]['name']} data"})
+            return
+        cached = playoff_odds_cache.get(league)
+        if cached and cached[:2] == (snapshot.etag, sims):
+            odds = cached[2]
+        else:
+            odds = playoff_odds.playoff_odds(league, snapshot.data, sims, playoff_odds.seed_for(snapshot.etag))
+            playoff_odds_cache[league] = (snapshot.etag, sims, odds)
+        self.send_json(odds)
+
+    def send_stream(self, league, query):
+        """Open a Server-Sent Events stream of a league's standings.
+
+        ?since=<version> works like Last-Event-ID: the current snapshot is
+        only sent right away if it is newer than that.
+        """
+        if league not in standings_cache:
+            self.send_json({'error': f'Unknown league: {league}'}, status=404)
+            return
+        # Make sure there is something to send before handing the socket over
+        standings_cache.get_snapshot(league)
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'keep-alive')
+        # Keep proxies such as nginx from buffering the stream
+        self.send_header('X-Accel-Buffering', 'no')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(f'retry: {RETRY_MS}\n\n'.encode())
+        self.wfile.flush()
+        self.close_connection = True
+        self.server.detach_request(self.connection)
+        last_event_id = self.headers.get('Last-Event-ID') or query.get('since', [None])[0]
+        stream_hub.subscribe(league, self.connection, last_event_id)
+
+    def send_ready(self):
+        """Readiness check: 200 once every league's cache is populated, 503 before"""
+        ready = prefetcher.ready()
+        self.send_json({'ready': ready, 'startup_seconds': startup_seconds, 'leagues': prefetcher.status()},
+                       status=200 if ready else 503)
+
+    def send_json(self, data, status=200, headers=None):
+        """Send an uncached JSON response"""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_text(self, text, content_type='text/plain; charset=utf-8'):
+        body = text.encode()
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_snapshot(self, snapshot, delta=None, stale_age=None):
+        """Send a standings snapshot (or the given delta body), or 304 if the client's copy is current.
+
+        stale_age (seconds) marks a snapshot restored from before a restart.
+        """
+        not_modified = self.is_not_modified(snapshot)
+        self.send_response(304 if not_modified else 200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', snapshot.etag)
+        self.send_header('Last-Modified', formatdate(snapshot.last_modified, usegmt=True))
+        self.send_header('X-Standings-Version', str(snapshot.version))
+        if stale_age is not None:
+            self.send_header('X-Standings-Stale', '1')
+            self.send_header('X-Standings-Age', str(int(stale_age)))
+        # Clients may keep the body but must revalidate before reusing it
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'ETag, Last-Modified, X-Standings-Version, X-Standings-Stale, X-Standings-Age')
+        if not_modified:
             self.end_headers()
-            
-            try:
-                import fetch_standings as nfl_fetch
-                data = nfl_fetch.fetch_nfl_standings()
-                if data:
-                    self.wfile.write(json.dumps(data).encode())
-                else:
-                    self.wfile.write(json.dumps({'error': 'Failed to fetch NFL data'}).encode())
-            except Exception as e:
-                self.wfile.write(json.dumps({'error': str(e)}).encode())
-                
-        elif self.path == '/api/standings/nba':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
+            return
+        if delta is not None:
+            # Deltas are small; they are sent uncompressed
+            encoding, body = 'identity', delta
+        else:
+            encoding = negotiate_encoding(self.headers.get('Accept-Encoding'))
+            body = snapshot.encoded[encoding]
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_asset(self, asset):
+        """Send a static asset from memory, or 304 if the client's copy is current"""
+        if_none_match = self.headers.get('If-None-Match')
+        not_modified = bool(if_none_match) and asset.etag in [
+            tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        self.send_response(304 if not_modified else 200)
+        self.send_header('Content-type', asset.content_type)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', asset.etag)
+        self.send_header('Cache-Control', asset.cache_control)
+        if not_modified:
             self.end_headers()
+            return
+        encoding = negotiate_encoding(self.headers.get('Accept-Encoding'))
+        if encoding not in asset.encoded:
+            encoding = 'identity'
+        body = asset.encoded[encoding]
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def is_not_modified(self, snapshot):
+        """Evaluate If-None-Match (preferred) or If-Modified-Since against a snapshot"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or any(tag.removeprefix('W/') == snapshot.etag for tag in tags)
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
             try:
-                # Try to import NBA fetch function if available
-                try:
-                    import fetch_nba_standings
-                    data = fetch_nba_standings.fetch_nba_standings()
-                except ImportError:
-                    # If no NBA module exists, return placeholder data
-                    data = self.get_placeholder_nba_data()
-                # Debug print the outgoing NBA data
-                print("\n--- NBA API OUTGOING DATA ---")
-                print(json.dumps(data, indent=2))
-                print("--- END NBA API OUTGOING DATA ---\n")
-                if data:
-                    self.wfile.write(json.dumps(data).encode())
-                else:
-                    self.wfile.write(json.dumps({'error': 'Failed to fetch NBA data'}).encode())
-            except Exception as e:
-                print(f"NBA fetch error: {e}")
-                self.wfile.write(json.dumps({'error': str(e)}).encode())
-        else:
-            super().do_GET()
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            # HTTP dates have one-second resolution
+            return int(snapshot.last_modified) <= since
+        return False
+
+def start_refreshing(parse_processes=0):
+    """Scrape, persist and schedule refreshes in this process.
+
+    Runs at startup with a single process, or in whichever process is
+    elected refresher with PROCESSES > 1.
+    """
+    global parse_pool
+    if parse_processes > 0:
+        from concurrent.futures import ProcessPoolExecutor
+        parse_pool = ProcessPoolExecutor(parse_processes)
+    for key in standings_cache.leagues():
+        standings_cache.fetchers[key] = functools.partial(fetch_league, key)
+    standings_cache.ttl = STANDINGS_TTL
+    standings_cache.add_listener(last_known_good.save)
+    if history_store is not None:
+        standings_cache.add_listener(history_store.append)
+    prefetcher.start()
+
+def force_refresh(key):
+    """Honor ?refresh=1 with at most one upstream scrape per FORCE_REFRESH_WINDOW"""
+    if shared_snapshots is not None and not shared_snapshots.refresher:
+        # Only the refresher scrapes; the new snapshot reaches this process when it lands
+        shared_snapshots.request_refresh(key)
+    else:
+        standings_cache.refresh_debounced(key, FORCE_REFRESH_WINDOW)
+
+def wait_for_refresher(key):
+    # Stands in for the scraper in non-refresher processes: a cold miss
+    # waits for the refresher's first snapshot to be installed
+    standings_cache.wait_for_change(key, None, FETCH_WAIT_TIMEOUT)
+
+def serve_process(port, workers, shared, parse_processes):
+    """Body of one forked server process: sync snapshots and serve on the shared port"""
+    global history_store
+    if HISTORY_DB:
+        # SQLite connections must not cross a fork, so each process opens its own
+        history_store = HistoryStore(HISTORY_DB)
+    server = make_server(('0.0.0.0', port), CombinedHandler, workers, reuse_port=True)
+    shared.start(functools.partial(start_refreshing, parse_processes))
+    server.serve_forever()
 
 if __name__ == '__main__':
     import os
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
     PORT = int(os.environ.get('PORT', 8000))
-    server = HTTPServer(('0.0.0.0', PORT), CombinedHandler)
-    print(f'Server running on port {PORT}...')
-    server.serve_forever()
+    # Request worker threads per process; 0 serves one request at a time
+    WORKERS = int(os.environ.get('WORKERS', 16))
+    # Server processes sharing the port; more than 1 forks (Unix only)
+    PROCESSES = int(os.environ.get('PROCESSES', 1))
+    # Processes for parsing scraped pages; 0 parses on the fetching thread
+    PARSE_PROCESSES = int(os.environ.get('PARSE_PROCESSES', 0))
+    # Serve the last-known-good standings until the first refresh lands;
+    # the scrapers are only imported by that refresh, in the background
+    restored = [key for key in standings_cache.leagues()
+                if (saved := last_known_good.load(key)) and standings_cache.prime(key, *saved)]
+    if HISTORY_DB:
+        history_store = HistoryStore(HISTORY_DB)
+        # Leagues without a saved file fall back to the newest stored history
+        for key in standings_cache.leagues():
+            stored = history_store.latest(key) if standings_cache.peek(key) is None else None
+            if stored:
+                snapshot = Snapshot(stored[1], last_modified=stored[0])
+                snapshot.restored = True
+                standings_cache.prime(key, snapshot)
+                restored.append(key)
+    summary = (f'{WORKERS or 1} worker thread(s)' + (f' in each of {PROCESSES} processes' if PROCESSES > 1 else '')
+               + (f", serving saved {', '.join(key.upper() for key in restored)} standings" if restored else ''))
+
+    if PROCESSES > 1:
+        import shutil
+        import tempfile
+        from shared_snapshots import SharedSnapshots
+        from threaded_server import prefork
+        if history_store is not None:
+            history_store.close()
+            history_store = None
+        # Until a process is elected refresher it only serves what the refresher publishes
+        for key in standings_cache.leagues():
+            standings_cache.fetchers[key] = functools.partial(wait_for_refresher, key)
+        standings_cache.ttl = float('inf')
+        # Each process sees only its share of a client's connections
+        rate_limiter.share(PROCESSES)
+        shared_dir = tempfile.mkdtemp(prefix='standings-')
+        shared_snapshots = SharedSnapshots(shared_dir, standings_cache, FORCE_REFRESH_WINDOW)
+        startup_seconds = time.perf_counter() - STARTED
+        print(f'Server running on port {PORT} with {summary}, started in {startup_seconds * 1000:.0f} ms...')
+        try:
+            prefork(PROCESSES, functools.partial(serve_process, PORT, WORKERS, shared_snapshots, PARSE_PROCESSES))
+        finally:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+    else:
+        server = make_server(('0.0.0.0', PORT), CombinedHandler, WORKERS)
+        start_refreshing(PARSE_PROCESSES)
+        startup_seconds = time.perf_counter() - STARTED
+        print(f'Server running on port {PORT} with {summary}, started in {startup_seconds * 1000:.0f} ms...')
+        server.serve_forever()
@@ -2,6 +2,10 @@ let currentLeague = 'nfl';
 let currentView = 'division';
 let nflData = null;
 let nbaData = null;
+// ETag / Last-Modified / version of the cached data per league, sent back on refresh
+const standingsValidators = {};
+// Open EventSource per league pushing standings as they change
+const standingsStreams = {};
 
 // Initialize
 document.addEventListener('DOMContentLoaded', () => {
@@ -19,7 +23,7 @@ document.addEventListener('DOMContentLoaded', () => {
             currentView = button.dataset.view;
             document.querySelectorAll('.view-button').forEach(b => b.classList.remove('active'));
             button.classList.add('active');
-            renderCurrentView();
+            showCurrentView();
         });
     });
 
@@ -28,10 +32,33 @@ document.addEventListener('DOMContentLoaded', () => {
         fetchStandings(currentLeague, true);
     });
 
-    // Initial load
-    switchLeague('nfl');
+    // Initial load: one request for every league, then show the NFL
+    preloadStandings(currentView).finally(() => switchLeague('nfl'));
 });
 
+// Load one view of every league in a single request (/api/standings?leagues=...&views=...),
+// so switching leagues renders without a round trip
+async function preloadStandings(view) {
+    try {
+        const response = await fetch(`/api/standings?leagues=nfl,nba&views=${view}`);
+        if (!response.ok) return;
+        const batch = await response.json();
+        Object.entries(batch).forEach(([league, entry]) => {
+            if (!entry.standings) return;
+            const data = (league === 'nfl' ? nflData : nbaData) || {};
+            data[view] = entry.standings[view];
+            if (league === 'nfl') {
+                nflData = data;
+            } else {
+                nbaData = data;
+            }
+            standingsValidators[league] = { etag: null, lastModified: null, version: String(entry.version) };
+        });
+    } catch (error) {
+        console.warn('Preload failed, loading leagues one at a time:', error);
+    }
+}
+
 function switchLeague(league) {
     currentLeague = league;
     
@@ -55,7 +82,55 @@ function switchLeague(league) {
         emblem.textContent = '🏀';
     }
     
-    fetchStandings(league);
+    // Preloaded leagues render right away and stay current through the stream
+    const data = league === 'nfl' ? nflData : nbaData;
+    if (data && data[currentView]) {
+        renderCurrentView();
+        document.getElementById('loading').style.display = 'none';
+        document.getElementById('content').style.display = 'block';
+        subscribeStandings(league);
+        return;
+    }
+    
+    // Subscribe once the first view has loaded, so the stream does not resend it
+    fetchStandings(league).then(() => subscribeStandings(league));
+}
+
+// Render the selected view, fetching it first if this league has not loaded it yet
+function showCurrentView() {
+    const data = currentLeague === 'nfl' ? nflData : nbaData;
+    if (data && data[currentView]) {
+        renderCurrentView();
+    } else {
+        fetchStandings(currentLeague);
+    }
+}
+
+function subscribeStandings(league) {
+    if (standingsStreams[league] || !window.EventSource) return;
+    
+    const version = standingsValidators[league] && standingsValidators[league].version;
+    const source = new EventSource(`/api/standings/${league}/stream` + (version ? `?since=${version}` : ''));
+    source.addEventListener('standings', event => {
+        const data = JSON.parse(event.data);
+        console.log(`Live update for ${league}:`, data);
+        
+        if (league === 'nfl') {
+            nflData = data;
+        } else {
+            nbaData = data;
+        }
+        // The event id is the snapshot version, usable for ?since= deltas
+        standingsValidators[league] = { etag: null, lastModified: null, version: event.lastEventId };
+        
+        if (league === currentLeague) {
+            renderCurrentView();
+        }
+    });
+    source.onerror = () => {
+        console.warn(`Standings stream for ${league} interrupted, reconnecting...`);
+    };
+    standingsStreams[league] = source;
 }
 
 async function fetchStandings(league, forceRefresh = false) {
@@ -66,18 +141,55 @@ async function fetchStandings(league, forceRefresh = false) {
     contentDiv.style.display = 'none';
     
     try {
-        const endpoint = `/api/standings/${league}`;
-        console.log(`Fetching from ${endpoint}...`);
-        const response = await fetch(endpoint);
-        const data = await response.json();
+        const cachedData = league === 'nfl' ? nflData : nbaData;
+        if (!cachedData || !cachedData[currentView]) {
+            // First paint: load only the view being shown
+            await fetchView(league, currentView);
+            renderCurrentView();
+            loadingDiv.style.display = 'none';
+            contentDiv.style.display = 'block';
+            return;
+        }
         
-        console.log(`Data received for ${league}:`, data);
-        console.log(`Conference data:`, data.conference);
+        const validators = standingsValidators[league];
+        const params = new URLSearchParams();
+        const headers = {};
+        if (cachedData && validators) {
+            // Ask for just the changes since the version we hold
+            if (validators.version) params.set('since', validators.version);
+            if (validators.etag) headers['If-None-Match'] = validators.etag;
+            if (validators.lastModified) headers['If-Modified-Since'] = validators.lastModified;
+        }
+        // The server scrapes at most once per window however many clients ask
+        if (forceRefresh) params.set('refresh', '1');
+        const endpoint = `/api/standings/${league}` + (params.toString() ? `?${params}` : '');
+        console.log(`Fetching from ${endpoint}...`);
+        const response = await fetch(endpoint, { headers });
         
-        if (league === 'nfl') {
-            nflData = data;
+        if (response.status === 429) {
+            console.warn(`Rate limited, retry in ${response.headers.get('Retry-After')}s; keeping cached ${league} data`);
+        } else if (response.status === 304) {
+            console.log(`${league} standings unchanged, using cached data`);
         } else {
-            nbaData = data;
+            let data = await response.json();
+            
+            if (data.changes && cachedData) {
+                console.log(`${league} delta since ${data.since}: ${data.changes.length} change(s)`);
+                data = applyStandingsDelta(cachedData, data);
+            }
+            console.log(`Data received for ${league}:`, data);
+            console.log(`Conference data:`, data.conference);
+            
+            if (league === 'nfl') {
+                nflData = data;
+            } else {
+                nbaData = data;
+            }
+            standingsValidators[league] = {
+                etag: response.headers.get('ETag'),
+                lastModified: response.headers.get('Last-Modified'),
+                version: response.headers.get('X-Standings-Version')
+            };
         }
         
         renderCurrentView();
@@ -90,6 +202,51 @@ async function fetchStandings(league, forceRefresh = false) {
     }
 }
 
+// Fetch one view (/api/standings/<league>/<view>) into the league's cached data
+async function fetchView(league, view) {
+    const endpoint = `/api/standings/${league}/${view}`;
+    console.log(`Fetching from ${endpoint}...`);
+    const response = await fetch(endpoint);
+    const viewData = await response.json();
+    if (viewData.error) throw new Error(viewData.error);
+    
+    const data = (league === 'nfl' ? nflData : nbaData) || {};
+    data[view] = viewData;
+    if (league === 'nfl') {
+        nflData = data;
+    } else {
+        nbaData = data;
+    }
+    // Views may arrive at different versions; deltas from the oldest one
+    // bring every loaded view up to date
+    const validators = standingsValidators[league];
+    standingsValidators[league] = {
+        etag: null,
+        lastModified: null,
+        version: (validators && validators.version) || response.headers.get('X-Standings-Version')
+    };
+}
+
+// Apply a server delta ({changes: [{path, teams, order?}]}) to cached standings;
+// changes to views that were never loaded are skipped
+function applyStandingsDelta(data, delta) {
+    const result = structuredClone(data);
+    delta.changes.filter(change => result[change.path[0]]).forEach(change => {
+        let parent = result;
+        change.path.slice(0, -1).forEach(key => {
+            parent = parent[key] = parent[key] || {};
+        });
+        const key = change.path[change.path.length - 1];
+        const oldTeams = parent[key] || [];
+        const byAbbr = {};
+        oldTeams.forEach(team => { byAbbr[team.abbr] = team; });
+        change.teams.forEach(team => { byAbbr[team.abbr] = team; });
+        const order = change.order || oldTeams.map(team => team.abbr);
+        parent[key] = order.map(abbr => byAbbr[abbr]);
+    });
+    return result;
+}
+
 function renderCurrentView() {
     const data = currentLeague === 'nfl' ? nflData : nbaData;
     if (!data) return;
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""On-disk history of parsed standings (SQLite, stdlib only).
+
+Every distinct snapshot a league produces is appended to ``snapshots`` with
+its JSON body, and each team whose overall record moved gets a row in
+``team_records``. Both tables are indexed by league and time (and team), so
+/api/history/<league>/<abbr> and /api/standings/<league>?at=<date> are
+answered from the index without touching upstream, and a restarted server
+can serve its last standings straight away.
+"""
+import json
+import os
+import sqlite3
+import threading
+
+from standings_engine import season_records
+
+# SQLite file for the history; empty disables it
+HISTORY_DB = os.environ.get('HISTORY_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'standings_history.sqlite3'))
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    league TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    etag TEXT NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_league_time ON snapshots (league, fetched_at);
+CREATE TABLE IF NOT EXISTS team_records (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    league TEXT NOT NULL,
+    abbr TEXT NOT NULL,
+    name TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER
+);
+CREATE INDEX IF NOT EXISTS team_records_league_team_time ON team_records (league, abbr, fetched_at);
+'''
+
+
+def overall_records(league, data):
+    """Return each team's season record entry (see standings_engine.season_records), by abbr"""
+    records = {}
+    for teams in season_records(league, data).values():
+        for team in teams:
+            records.setdefault(team.get('abbr'), team)
+    return records
+
+
+class HistoryStore:
+    """Append-only standings history in one SQLite file, shared across threads"""
+
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+        # league -> {abbr: (wins, losses, ties)} as last stored
+        self._last_records = {}
+        self._last_etags = {}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def append(self, league, snapshot):
+        """Store a snapshot unless it matches the league's latest one; returns True if stored"""
+        with self._lock:
+            if league not in self._last_etags:
+                row = self._db.execute('SELECT etag FROM snapshots WHERE league = ? ORDER BY fetched_at DESC LIMIT 1',
+                                       (league,)).fetchone()
+                self._last_etags[league] = row[0] if row else None
+            if self._last_etags[league] == snapshot.etag:
+                return False
+
+            last = self._last_team_records(league)
+            with self._db:
+                cursor = self._db.execute(
+                    'INSERT INTO snapshots (league, fetched_at, etag, body) VALUES (?, ?, ?, ?)',
+                    (league, snapshot.last_modified, snapshot.etag, snapshot.body))
+                rows = []
+                for abbr, team in overall_records(league, snapshot.data).items():
+                    record = (team.get('wins'), team.get('losses'), team.get('ties'))
+                    if last.get(abbr) != record:
+                        rows.append((cursor.lastrowid, league, abbr, team.get('name'), snapshot.last_modified) + record)
+                        last[abbr] = record
+                self._db.executemany(
+                    'INSERT INTO team_records (snapshot_id, league, abbr, name, fetched_at, wins, losses, ties) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            self._last_etags[league] = snapshot.etag
+            return True
+
+    def _last_team_records(self, league):
+        last = self._last_records.get(league)
+        if last is None:
+            # SQLite returns the row holding MAX(fetched_at) for each team
+            rows = self._db.execute(
+                'SELECT abbr, wins, losses, ties, MAX(fetched_at) FROM team_records WHERE league = ? GROUP BY abbr',
+                (league,))
+            last = self._last_records[league] = {abbr: (wins, losses, ties) for abbr, wins, losses, ties, _ in rows}
+        return last
+
+    def latest(self, league):
+        """Return (fetched_at, data) for the league's newest stored snapshot, or None"""
+        return self.at(league, float('inf'))
+
+    def at(self, league, timestamp):
+        """Return (fetched_at, data) for the newest snapshot stored at or before timestamp, or None"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT fetched_at, body FROM snapshots WHERE league = ? AND fetched_at <= ? '
+                'ORDER BY fetched_at DESC LIMIT 1', (league, timestamp)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def team_history(self, league, abbr, since=None, until=None):
+        """Return a team's record changes, oldest first, as dicts with a unix 'time'"""
+        query = 'SELECT fetched_at, name, wins, losses, ties FROM team_records WHERE league = ? AND abbr = ?'
+        params = [league, abbr]
+        if since is not None:
+            query += ' AND fetched_at >= ?'
+            params.append(since)
+        if until is not None:
+            query += ' AND fetched_at <= ?'
+            params.append(until)
+        with self._lock:
+            rows = self._db.execute(query + ' ORDER BY fetched_at', params).fetchall()
+        history = []
+        for fetched_at, name, wins, losses, ties in rows:
+            entry = {'time': fetched_at, 'name': name, 'wins': wins, 'losses': losses}
+            if ties is not None:
+                entry['ties'] = ties
+            history.append(entry)
+        return history
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Last-known-good standings, persisted per league for fast cold starts.
+
+Every new snapshot is written to STATE_DIR/<league>.json (temp file, fsync,
+rename, so a crash never leaves a torn file). On startup the server loads
+these files, which takes milliseconds and needs none of the scraper
+imports, and serves them flagged as stale until the first live refresh
+lands.
+"""
+import json
+import os
+import tempfile
+import time
+
+from standings_cache import Snapshot
+from team_record import StandingsEncoder
+
+# Where last-known-good snapshots live; empty disables them
+STATE_DIR = os.environ.get('STATE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'state'))
+
+
+def _path(league):
+    return os.path.join(STATE_DIR, f'{league}.json')
+
+
+def save(league, snapshot):
+    """Atomically replace the league's saved snapshot; returns the file path"""
+    if not STATE_DIR:
+        return None
+    os.makedirs(STATE_DIR, exist_ok=True)
+    state = {
+        'league': league,
+        'saved_at': time.time(),
+        'last_modified': snapshot.last_modified,
+        'version': snapshot.version,
+        'data': snapshot.data,
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=STATE_DIR, prefix=f'.{league}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f, cls=StandingsEncoder, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, _path(league))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return _path(league)
+
+
+def load(league):
+    """Return (Snapshot, saved_at) from the league's saved file, or None if missing or unreadable"""
+    if not STATE_DIR:
+        return None
+    try:
+        with open(_path(league), encoding='utf-8') as f:
+            state = json.load(f)
+        snapshot = Snapshot(state['data'], last_modified=state['last_modified'])
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ignoring saved {league.upper()} snapshot: {e}")
+        return None
+    snapshot.version = state.get('version', snapshot.version)
+    snapshot.restored = True
+    return snapshot, state['saved_at']
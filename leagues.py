@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Declarative registry of the leagues the standings engine can scrape.
+
+Each entry describes one plaintextsports.com standings page: where it lives,
+how its section headers map to conferences and divisions, the record format
+(W-L or W-L-T) and the rules each view parser follows. standings_engine.py
+parses every league from these entries, and combined_api.py serves a
+/api/standings/<key> route per entry, so adding a league is a matter of
+registering another config here.
+
+View rules:
+  division_view   header: header kind that opens a division
+                  line: 'team' (ABBR W L [T]) or 'group' (N:ABBR ... W-L)
+                  size: max teams per division (None for no limit)
+                  unique_per: 'division' or 'conference' de-duplication
+                  end_on_blank / end_on_footer: lines that close the section
+  conference_view start / end: header kinds that open / close a section
+                  line, size, end_on_footer: as above
+  league_view     start / end: header kinds, or from_conferences=True to
+                  merge the conference lists instead of parsing the page
+  playoffs_view   conference: header kinds that switch conference
+                  leaders_max_seed: highest seed listed as a division leader
+  sorted_views    views re-sorted by record after parsing
+  sync_divisions  copy conference-view records onto division entries
+
+Optional keys (refresh scheduling, see prefetch.py):
+  refresh_interval       starting seconds between refreshes (default STANDINGS_TTL)
+  min_refresh_interval   bounds for the adaptive interval (defaults 60 / 3600)
+  max_refresh_interval
+  game_windows           "Sun 13:00-24:00, Mon 20:00-24:00" in the league's
+                         timezone; <KEY>_GAME_WINDOWS in the environment overrides
+  game_refresh_interval  longest interval allowed inside a game window
+  timezone               IANA zone for game_windows (default UTC)
+
+Playoff odds (see playoff_odds.py):
+  playoff_odds    season_games, playoff_spots, play_in_spots, bye_seeds and
+                  division_winners (division leaders take the top seeds)
+  season_records  view holding each team's season record (default
+                  'conference'); 'playoffs' where the other views are not
+                  season standings (the NBA's are Cup group records)
+"""
+
+NFL_TEAMS = {
+    'NE': 'New England Patriots', 'BUF': 'Buffalo Bills', 'MIA': 'Miami Dolphins', 'NYJ': 'New York Jets',
+    'BAL': 'Baltimore Ravens', 'PIT': 'Pittsburgh Steelers', 'CIN': 'Cincinnati Bengals', 'CLE': 'Cleveland Browns',
+    'IND': 'Indianapolis Colts', 'JAX': 'Jacksonville Jaguars', 'HOU': 'Houston Texans', 'TEN': 'Tennessee Titans',
+    'DEN': 'Denver Broncos', 'LAC': 'Los Angeles Chargers', 'KC': 'Kansas City Chiefs', 'LV': 'Las Vegas Raiders',
+    'PHI': 'Philadelphia Eagles', 'DAL': 'Dallas Cowboys', 'WAS': 'Washington Commanders', 'NYG': 'New York Giants',
+    'CHI': 'Chicago Bears', 'GB': 'Green Bay Packers', 'DET': 'Detroit Lions', 'MIN': 'Minnesota Vikings',
+    'TB': 'Tampa Bay Buccaneers', 'CAR': 'Carolina Panthers', 'ATL': 'Atlanta Falcons', 'NO': 'New Orleans Saints',
+    'LAR': 'Los Angeles Rams', 'SEA': 'Seattle Seahawks', 'SF': 'San Francisco 49ers', 'ARI': 'Arizona Cardinals'
+}
+
+NBA_TEAMS = {
+    'ATL': 'Atlanta Hawks', 'BOS': 'Boston Celtics', 'BKN': 'Brooklyn Nets', 'CHA': 'Charlotte Hornets',
+    'CHI': 'Chicago Bulls', 'CLE': 'Cleveland Cavaliers', 'DAL': 'Dallas Mavericks', 'DEN': 'Denver Nuggets',
+    'DET': 'Detroit Pistons', 'GSW': 'Golden State Warriors', 'GS': 'Golden State Warriors',
+    'HOU': 'Houston Rockets', 'IND': 'Indiana Pacers', 'LAC': 'Los Angeles Clippers', 'LAL': 'Los Angeles Lakers',
+    'MEM': 'Memphis Grizzlies', 'MIA': 'Miami Heat', 'MIL': 'Milwaukee Bucks', 'MIN': 'Minnesota Timberwolves',
+    'NOP': 'New Orleans Pelicans', 'NO': 'New Orleans Pelicans', 'NYK': 'New York Knicks', 'NY': 'New York Knicks',
+    'OKC': 'Oklahoma City Thunder', 'ORL': 'Orlando Magic', 'PHI': 'Philadelphia 76ers', 'PHX': 'Phoenix Suns',
+    'POR': 'Portland Trail Blazers', 'SAC': 'Sacramento Kings', 'SAS': 'San Antonio Spurs', 'SA': 'San Antonio Spurs',
+    'TOR': 'Toronto Raptors', 'UTA': 'Utah Jazz', 'WAS': 'Washington Wizards', 'WSH': 'Washington Wizards'
+}
+
+LEAGUES = {
+    'nfl': {
+        'name': 'NFL',
+        'url': 'https://plaintextsports.com/nfl/2025/standings',
+        'record': ('wins', 'losses', 'ties'),
+        'teams': NFL_TEAMS,
+        'conferences': ('AFC', 'NFC'),
+        'divisions': {
+            'AFC': ('East', 'North', 'South', 'West'),
+            'NFC': ('East', 'North', 'South', 'West'),
+        },
+        # Keyed by the text before the first ':' on a line -> (kind, conference, division)
+        'headers': {
+            'AFC East': ('division', 'AFC', 'East'), 'AFC North': ('division', 'AFC', 'North'),
+            'AFC South': ('division', 'AFC', 'South'), 'AFC West': ('division', 'AFC', 'West'),
+            'NFC East': ('division', 'NFC', 'East'), 'NFC North': ('division', 'NFC', 'North'),
+            'NFC South': ('division', 'NFC', 'South'), 'NFC West': ('division', 'NFC', 'West'),
+            'American Football Conference': ('conference', 'AFC', None),
+            'National Football Conference': ('conference', 'NFC', None),
+            'NFL': ('league', None, None),
+            'Division Leaders': ('division_leaders', None, None),
+            'Wild Card': ('wild_card', None, None),
+        },
+        'division_view': {'header': 'division', 'line': 'team', 'size': 4, 'unique_per': 'division'},
+        'conference_view': {'start': ('conference',), 'end': ('league', 'division_leaders'),
+                            'line': 'team', 'size': 16},
+        'league_view': {'start': ('league',), 'end': ('division_leaders', 'conference')},
+        'playoffs_view': {'conference': ('conference',), 'leaders_max_seed': 4},
+        'sorted_views': ('conference',),
+        'sync_divisions': False,
+        'game_windows': 'Thu 20:00-24:00, Sun 13:00-24:00, Mon 20:00-24:00',
+        'game_refresh_interval': 60,
+        'timezone': 'America/New_York',
+        'playoff_odds': {'season_games': 17, 'playoff_spots': 7, 'bye_seeds': 1, 'division_winners': True},
+    },
+    'nba': {
+        'name': 'NBA',
+        'url': 'https://plaintextsports.com/nba/2025-2026/standings',
+        'record': ('wins', 'losses'),
+        'teams': NBA_TEAMS,
+        'conferences': ('Eastern', 'Western'),
+        'divisions': {
+            'Eastern': ('Atlantic', 'Central', 'Southeast'),
+            'Western': ('Northwest', 'Pacific', 'Southwest'),
+        },
+        # NBA Cup groups stand in for the traditional divisions on the frontend
+        'headers': {
+            'East A': ('group', 'Eastern', 'Atlantic'), 'East B': ('group', 'Eastern', 'Central'),
+            'East C': ('group', 'Eastern', 'Southeast'), 'West A': ('group', 'Western', 'Northwest'),
+            'West B': ('group', 'Western', 'Pacific'), 'West C': ('group', 'Western', 'Southwest'),
+            'Eastern Conference': ('conference', 'Eastern', None),
+            'Western Conference': ('conference', 'Western', None),
+            'Eastern Conference Knockout Round': ('knockout', 'Eastern', None),
+            'Western Conference Knockout Round': ('knockout', 'Western', None),
+            'NBA': ('league', None, None),
+        },
+        # Footer lines start with footer_prefix or mention footer_marker
+        'footer_prefix': '*',
+        'footer_marker': 'plaintextsports',
+        'division_view': {'header': 'group', 'line': 'group', 'size': None, 'unique_per': 'conference',
+                          'end_on_blank': True, 'end_on_footer': True},
+        # Any East/West header (Cup group, conference or knockout round) opens group-format lines
+        'conference_view': {'start': ('group', 'conference', 'knockout'), 'end': (),
+                            'line': 'group', 'size': 15, 'end_on_footer': True},
+        'league_view': {'start': ('league',), 'end': ('conference', 'knockout'), 'from_conferences': True},
+        'playoffs_view': {'conference': ('conference', 'knockout'), 'leaders_max_seed': 6},
+        'sorted_views': ('conference', 'division', 'league'),
+        'sync_divisions': True,
+        'game_windows': ('Mon 19:00-01:00, Tue 19:00-01:00, Wed 19:00-01:00, Thu 19:00-01:00, '
+                         'Fri 19:00-01:00, Sat 13:00-01:00, Sun 13:00-01:00'),
+        'game_refresh_interval': 60,
+        'timezone': 'America/New_York',
+        'playoff_odds': {'season_games': 82, 'playoff_spots': 6, 'play_in_spots': 4, 'bye_seeds': 0,
+                         'division_winners': False},
+        # Only the seeded / eliminated lines carry season W-L; the rest are Cup group records
+        'season_records': 'playoffs',
+    },
+}
+
+
+def get_league(key):
+    """Return the config for a league key; raises KeyError for unknown leagues"""
+    return LEAGUES[key]
+
+
+def register_league(key, config):
+    """Add (or replace) a league.
+
+    The engine reads LEAGUES on every parse, but combined_api builds its
+    cache, refresh schedules, metrics and routes from it once, when it is
+    imported, so register leagues before importing combined_api.
+    """
+    LEAGUES[key] = config
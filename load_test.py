@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Measure combined_api.py request throughput as concurrent clients increase.
+
+Usage: python3 load_test.py [--workers N] [--latency SECONDS] [--requests N]
+
+Starts the combined handler on a local port twice - single-threaded and with
+a pool of --workers threads - and fires a mix of static file and standings
+API requests from 1..32 concurrent clients. The NFL fetcher behind the
+standings cache is replaced with a stub that sleeps --latency seconds to
+stand in for an upstream scrape, so nothing touches plaintextsports.com.
+"""
+import argparse
+import functools
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import combined_api
+from threaded_server import make_server
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PATHS = ['/combined_index.html', '/styles.css', '/combined_script.js', '/api/standings/nfl']
+CLIENTS = [1, 4, 16, 32]
+
+def slow_standings(latency):
+    time.sleep(latency)
+    return {'division': {}, 'conference': {}, 'league': [], 'playoffs': {}}
+
+def run_clients(base_url, clients, total):
+    def hit(i):
+        with urllib.request.urlopen(base_url + PATHS[i % len(PATHS)]) as response:
+            response.read()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(hit, range(total)))
+    return total / (time.perf_counter() - start)
+
+def measure(workers, args):
+    handler = functools.partial(combined_api.CombinedHandler, directory=ROOT)
+    handler.log_message = lambda *a: None
+    server = make_server(('127.0.0.1', 0), handler, workers)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        return [run_clients(base_url, clients, args.requests) for clients in CLIENTS]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WORKERS', 16)))
+    parser.add_argument('--latency', type=float, default=0.05, help='simulated upstream latency per API call')
+    parser.add_argument('--requests', type=int, default=200, help='requests per concurrency level')
+    args = parser.parse_args()
+
+    combined_api.CombinedHandler.log_message = lambda *a: None
+    # Every request comes from 127.0.0.1; the per-client limit would reject most of them
+    combined_api.rate_limiter.rate = 0
+    combined_api.standings_cache.fetchers['nfl'] = functools.partial(slow_standings, args.latency)
+
+    print(f"{'clients':>8} " + ' '.join(f'{c:>8}' for c in CLIENTS))
+    for workers in (0, args.workers):
+        rates = measure(workers, args)
+        label = 'serial' if workers == 0 else f'{workers} thr'
+        print(f'{label:>8} ' + ' '.join(f'{rate:8.1f}' for rate in rates) + '  req/s')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Monte Carlo playoff odds from parsed standings (requires NumPy).
+
+plaintextsports.com has no remaining schedule, so each team's remaining
+games are the league's season length minus games played, and every game is
+won with the team's regressed win percentage (record shrunk toward .500 by
+a prior of a quarter season). Whole seasons are sampled at once: one
+binomial win count per (simulation, team), then every conference is seeded with
+array operations. Ties in the final standings are broken at random, since
+head-to-head and other tiebreakers need data the page does not have.
+
+Seeding follows the league's 'playoff_odds' config: with division_winners
+the best team in each division takes the top seeds and the rest of the
+playoff spots go to the best remaining records (NFL); without it the top
+playoff_spots records qualify and the next play_in_spots reach the play-in
+(NBA). Seeds up to bye_seeds get a first-round bye.
+"""
+import hashlib
+import math
+
+import numpy as np
+
+from leagues import get_league
+from standings_engine import season_records
+
+# Default and maximum simulated seasons per request
+DEFAULT_SIMULATIONS = 10_000
+MAX_SIMULATIONS = 100_000
+
+
+def _teams(key, data):
+    """Conference -> list of (abbr, name, wins, losses, ties) from the season records"""
+    conferences = {}
+    for conf, teams in season_records(key, data).items():
+        conferences[conf] = [(t.get('abbr'), t.get('name'), t.get('wins'), t.get('losses'), t.get('ties') or 0)
+                             for t in teams]
+    return conferences
+
+
+def _divisions(data, conf, abbrs):
+    """Column indices of each division's teams within a conference"""
+    index = {abbr: i for i, abbr in enumerate(abbrs)}
+    return [[index[t.get('abbr')] for t in teams if t.get('abbr') in index]
+            for teams in data['division'].get(conf, {}).values()]
+
+
+def _sample_wins(remaining, strength, simulations, rng):
+    """Draw (simulations, teams) binomial win counts by inverse CDF.
+
+    Equivalent to rng.binomial(remaining, strength, size=...) but about 3x
+    faster: with one (games, p) pair per team, a sorted search of uniform
+    draws in that team's small CDF table beats per-draw binomial sampling.
+    """
+    uniform = rng.random((len(remaining), simulations))
+    wins = np.empty((simulations, len(remaining)), dtype=np.int64)
+    for team, (games, p) in enumerate(zip(remaining.tolist(), strength.tolist())):
+        pmf = [math.comb(games, k) * p ** k * (1 - p) ** (games - k) for k in range(games + 1)]
+        cdf = np.cumsum(pmf)
+        wins[:, team] = np.minimum(np.searchsorted(cdf, uniform[team], side='right'), games)
+    return wins
+
+
+def simulate_conference(records, rules, divisions=(), simulations=DEFAULT_SIMULATIONS, rng=None):
+    """Simulate one conference; records is an array of (wins, losses, ties) rows.
+
+    Returns (seed_counts, sims): seed_counts[t, s] is how often team t finished
+    with seed s + 1 (columns for every position, not just playoff seeds).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    records = np.asarray(records, dtype=np.float64).reshape(-1, 3)
+    teams = len(records)
+    wins, losses, ties = records.T
+    played = wins + losses + ties
+    season = rules['season_games']
+    remaining = np.maximum(season - played, 0).astype(np.int64)
+
+    prior = season / 4
+    strength = (wins + ties / 2 + prior / 2) / (played + prior)
+
+    # (simulations, teams) final scores; ties count as half a win, noise breaks exact ties
+    extra = _sample_wins(remaining, strength, simulations, rng)
+    score = wins + ties / 2 + extra + rng.random((simulations, teams)) * 1e-3
+
+    key = score
+    if rules.get('division_winners') and divisions:
+        leader = np.zeros((simulations, teams), dtype=bool)
+        rows = np.arange(simulations)
+        for columns in divisions:
+            if columns:
+                columns = np.asarray(columns)
+                leader[rows, columns[np.argmax(score[:, columns], axis=1)]] = True
+        # Division winners are seeded ahead of every other team
+        key = score + leader * (season + 1)
+
+    order = np.argsort(-key, axis=1)
+    ranks = np.empty_like(order)
+    ranks[np.arange(simulations)[:, None], order] = np.arange(teams)
+    seed_counts = np.bincount((ranks + np.arange(teams) * teams).ravel(), minlength=teams * teams).reshape(teams, teams)
+    return seed_counts, simulations
+
+
+def playoff_odds(key, data, simulations=DEFAULT_SIMULATIONS, seed=None):
+    """Return per-team playoff, bye, play-in and seed probabilities for a league's standings"""
+    rules = get_league(key)['playoff_odds']
+    rng = np.random.default_rng(seed)
+    spots = rules['playoff_spots']
+    play_in = rules.get('play_in_spots', 0)
+    byes = rules.get('bye_seeds', 0)
+
+    result = {}
+    for conf, teams in _teams(key, data).items():
+        if not teams:
+            result[conf] = []
+            continue
+        abbrs = [team[0] for team in teams]
+        counts, sims = simulate_conference([team[2:] for team in teams], rules,
+                                           _divisions(data, conf, abbrs), simulations, rng)
+        probs = counts / sims
+        entries = []
+        for i, (abbr, name, wins, losses, ties) in enumerate(teams):
+            entry = {
+                'abbr': abbr,
+                'name': name,
+                'playoffs': round(float(probs[i, :spots].sum()), 4),
+                'bye': round(float(probs[i, :byes].sum()), 4),
+                'seeds': [round(float(p), 4) for p in probs[i, :spots]],
+            }
+            if play_in:
+                entry['play_in'] = round(float(probs[i, spots:spots + play_in].sum()), 4)
+            entries.append(entry)
+        entries.sort(key=lambda entry: (-entry['playoffs'], -entry['bye'], entry['abbr']))
+        result[conf] = entries
+    return {'league': key, 'simulations': simulations, 'conferences': result}
+
+
+def seed_for(etag):
+    """Stable RNG seed for a snapshot, so repeated requests get the same odds"""
+    return int(hashlib.sha1(etag.encode()).hexdigest()[:16], 16)
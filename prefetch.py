@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""Startup warm-up and adaptive per-league refresh schedules for a StandingsCache.
+
+At startup every league is fetched in parallel, so the first visitor after a
+deploy gets a warm cache and NFL and NBA do not queue behind each other.
+Afterwards each league has its own scheduler thread driven by a
+RefreshPolicy. It keeps a moving average of how often refreshes change the
+standings and sets the interval on a log scale between min_refresh_interval
+(every refresh changes something) and max_refresh_interval (none do), so a
+single stray change after a quiet spell only shortens it a little. Inside
+the league's game windows the interval is capped at game_refresh_interval.
+``ready()`` reports whether every league has a snapshot, for health checks,
+and ``metrics()`` the scheduler's recent decisions.
+"""
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+from leagues import LEAGUES
+
+# Seconds to wait before retrying a league whose refresh failed
+RETRY_INTERVAL = 30
+# Longest a scheduler sleeps before re-checking its interval (e.g. a game window opening)
+CHECK_INTERVAL = 60
+# Default interval bounds, in seconds
+MIN_INTERVAL = 60
+MAX_INTERVAL = 3600
+# Weight of the latest refresh in the change-rate moving average
+CHANGE_RATE_ALPHA = 0.1
+# Decisions kept per league for metrics()
+DECISION_LOG_SIZE = 20
+
+DAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+
+def _minutes(clock):
+    hours, _, minutes = clock.partition(':')
+    return int(hours) * 60 + int(minutes or 0)
+
+
+def parse_game_windows(spec):
+    """Parse "Sun 13:00-24:00, Mon 20:00-24:00" into (weekday, start, end) minute tuples.
+
+    Windows whose end is not after their start run past midnight.
+    """
+    windows = []
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        day, _, hours = item.strip().partition(' ')
+        start, _, end = hours.strip().partition('-')
+        start, end = _minutes(start), _minutes(end)
+        if end <= start:
+            end += 24 * 60
+        windows.append((DAYS.index(day[:3].lower()), start, end))
+    return windows
+
+
+def _timezone(name):
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception as e:
+        print(f"Unknown timezone {name}, using UTC for game windows: {e}")
+        return timezone.utc
+
+
+class RefreshPolicy:
+    """Chooses a league's refresh interval from its change rate and game windows"""
+
+    def __init__(self, base, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL,
+                 game_windows=(), game_interval=None, tz=timezone.utc):
+        self.min_interval = min(min_interval, base)
+        self.max_interval = max(max_interval, base)
+        self.game_windows = list(game_windows)
+        self.game_interval = game_interval or self.min_interval
+        self.tz = tz
+        self.failed = False
+        # Start at the change rate whose interval is base
+        self.change_rate = 0.0
+        if self.max_interval > self.min_interval:
+            self.change_rate = math.log(self.max_interval / base) / math.log(self.max_interval / self.min_interval)
+        self.current = base
+        self.refreshes = 0
+        self.changes = 0
+        self.failures = 0
+        self.decisions = deque(maxlen=DECISION_LOG_SIZE)
+
+    @classmethod
+    def for_league(cls, key, base):
+        """Build a policy from a league's config; <KEY>_GAME_WINDOWS overrides its game windows"""
+        league = LEAGUES.get(key, {})
+        windows = os.environ.get(f'{key.upper()}_GAME_WINDOWS', league.get('game_windows', ''))
+        return cls(base,
+                   league.get('min_refresh_interval', MIN_INTERVAL),
+                   league.get('max_refresh_interval', MAX_INTERVAL),
+                   parse_game_windows(windows),
+                   league.get('game_refresh_interval'),
+                   _timezone(league.get('timezone', 'UTC')))
+
+    def in_game_window(self, now=None):
+        local = datetime.fromtimestamp(time.time() if now is None else now, self.tz)
+        minute = local.hour * 60 + local.minute
+        for day, start, end in self.game_windows:
+            offset = (local.weekday() - day) % 7 * 24 * 60 + minute
+            if start <= offset < end:
+                return True
+        return False
+
+    def interval(self, now=None):
+        """Seconds between refreshes right now"""
+        if self.failed:
+            return min(self.current, RETRY_INTERVAL)
+        if self.in_game_window(now):
+            return min(self.current, self.game_interval)
+        return self.current
+
+    def interval_for(self, change_rate):
+        """Interval for a change rate: max_interval at 0, min_interval at 1, geometric in between"""
+        return self.max_interval * (self.min_interval / self.max_interval) ** change_rate
+
+    def record(self, ok, changed, now=None):
+        """Update the interval after a refresh; returns the decision logged for it"""
+        self.refreshes += 1
+        self.failed = not ok
+        if not ok:
+            self.failures += 1
+            reason = 'failed'
+        else:
+            self.changes += changed
+            reason = 'changed' if changed else 'unchanged'
+            self.change_rate += CHANGE_RATE_ALPHA * ((1.0 if changed else 0.0) - self.change_rate)
+            self.current = self.interval_for(self.change_rate)
+        in_window = self.in_game_window(now)
+        decision = {
+            'time': datetime.fromtimestamp(time.time() if now is None else now, timezone.utc).isoformat(timespec='seconds'),
+            'reason': reason,
+            'game_window': in_window,
+            'interval': round(self.interval(now), 1),
+        }
+        self.decisions.append(decision)
+        return decision
+
+    def metrics(self, now=None):
+        return {
+            'interval': round(self.interval(now), 1),
+            'game_window': self.in_game_window(now),
+            'change_rate': round(self.change_rate, 3),
+            'refreshes': self.refreshes,
+            'changes': self.changes,
+            'failures': self.failures,
+            'decisions': list(self.decisions),
+        }
+
+
+class Prefetcher:
+    """Warms and then adaptively refreshes every league in a cache"""
+
+    def __init__(self, cache, intervals=None):
+        self.cache = cache
+        self.policies = {
+            league: RefreshPolicy.for_league(
+                league,
+                (intervals or {}).get(league) or LEAGUES.get(league, {}).get('refresh_interval') or cache.ttl)
+            for league in cache.leagues()
+        }
+        self._next_refresh = {}
+        # league -> (ok, changed) of its warm-up fetch; missing if it did not finish
+        self._warmed = {}
+        self._started = False
+
+    def ready(self):
+        """True once every league has a snapshot"""
+        return all(self.cache.peek(league) is not None for league in self.cache.leagues())
+
+    def status(self):
+        """Per-league readiness, snapshot age and seconds until the next scheduled refresh"""
+        now = time.monotonic()
+        status = {}
+        for league in self.cache.leagues():
+            age = self.cache.age(league)
+            due = self._next_refresh.get(league)
+            snapshot = self.cache.peek(league)
+            status[league] = {
+                'ready': snapshot is not None,
+                # Still serving a copy saved before the last restart
+                'restored': snapshot is not None and snapshot.restored,
+                'age': None if age is None else round(age, 1),
+                'next_refresh': None if due is None else round(max(due - now, 0), 1),
+            }
+        return status
+
+    def metrics(self):
+        """Status plus each league's refresh policy state and recent decisions"""
+        status = self.status()
+        for league, policy in self.policies.items():
+            status[league].update(policy.metrics())
+        return status
+
+    def warm(self, timeout=None):
+        """Fetch every league in parallel; returns True if all of them now have a snapshot"""
+        leagues = self.cache.leagues()
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=len(leagues) or 1, thread_name_prefix='warmup') as pool:
+            futures = {league: pool.submit(self._refresh, league) for league in leagues}
+            wait(futures.values(), timeout)
+            self._warmed = {league: future.result() for league, future in futures.items()
+                            if future.done() and future.exception() is None}
+        print(f"Warm-up of {', '.join(leagues)} finished in {time.monotonic() - started:.2f}s")
+        return self.ready()
+
+    def start(self):
+        """Warm up in the background, then keep each league fresh on its own schedule"""
+        if self._started:
+            return
+        self._started = True
+        threading.Thread(target=self._warm_and_schedule, daemon=True, name='warmup').start()
+
+    def _warm_and_schedule(self):
+        self.warm()
+        for league in self.cache.leagues():
+            threading.Thread(target=self._schedule, args=(league,), daemon=True,
+                             name=f'refresh-{league}').start()
+
+    def _refresh(self, league):
+        # Returns (ok, changed): whether the fetch succeeded and produced new content
+        before = self.cache.peek(league)
+        started = time.monotonic()
+        snapshot = self.cache.refresh(league)
+        age = self.cache.age(league)
+        ok = age is not None and age <= time.monotonic() - started
+        return ok, ok and snapshot is not before
+
+    def _schedule(self, league):
+        policy = self.policies[league]
+        # A snapshot restored at startup is no success: retry soon if the warm-up fetch failed
+        policy.failed = not self._warmed.get(league, (False, False))[0]
+        last = time.monotonic()
+        while True:
+            interval = policy.interval()
+            # Requests treat the snapshot as fresh for the scheduled interval, so
+            # the scheduler rather than traffic decides when upstream is hit
+            self.cache.set_ttl(league, interval * 2)
+            due = last + interval
+            self._next_refresh[league] = due
+            now = time.monotonic()
+            if now < due:
+                time.sleep(min(due - now, CHECK_INTERVAL))
+                continue
+            last = now
+            ok, changed = self._refresh(league)
+            decision = policy.record(ok, changed)
+            print(f"{league.upper()} refresh {decision['reason']}, next in {decision['interval']:.0f}s"
+                  + (' (game window)' if decision['game_window'] else ''))
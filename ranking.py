@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Record-ordered standings groupings that re-rank incrementally.
+
+Each (league, grouping) keeps its last order, e.g. ('nfl', 'conference', 'AFC').
+When a refresh hands over new records for the same teams, only the teams
+whose record changed are taken out and bisected back into place; the rest
+keep their relative order. If most of the grouping changed, or its teams
+differ, it is simply re-sorted.
+"""
+import bisect
+import threading
+
+
+class Ranking:
+    """Teams of one grouping in record order, with their sort keys"""
+    __slots__ = ('teams', 'keys')
+
+    def __init__(self, teams):
+        self.teams = sorted(teams, key=sort_key)
+        self.keys = [team.sort_key for team in self.teams]
+
+    def update(self, teams):
+        """Re-rank for a new set of records; returns True if done incrementally"""
+        by_abbr = {team.abbr: team for team in teams}
+        if len(by_abbr) != len(teams) or len(teams) != len(self.teams) or any(
+                team.abbr not in by_abbr for team in self.teams):
+            self.__init__(teams)
+            return False
+
+        ranked, keys, moved = [], [], []
+        for old_team, old_key in zip(self.teams, self.keys):
+            team = by_abbr[old_team.abbr]
+            if team.sort_key == old_key:
+                ranked.append(team)
+                keys.append(old_key)
+            else:
+                moved.append(team)
+
+        if len(moved) * 2 > len(teams):
+            self.__init__(teams)
+            return False
+        # Unchanged teams are still in order; bisect the movers back in
+        for team in moved:
+            index = bisect.bisect_right(keys, team.sort_key)
+            keys.insert(index, team.sort_key)
+            ranked.insert(index, team)
+        self.teams, self.keys = ranked, keys
+        return True
+
+
+def sort_key(team):
+    return team.sort_key
+
+
+# (league key, *grouping) -> Ranking
+_rankings = {}
+_lock = threading.Lock()
+
+
+def rank(grouping, teams):
+    """Return teams in record order, reusing the grouping's previous ranking"""
+    with _lock:
+        ranking = _rankings.get(grouping)
+        if ranking is None:
+            ranking = _rankings[grouping] = Ranking(teams)
+        else:
+            ranking.update(teams)
+        return list(ranking.teams)
+
+
+def reset(league=None):
+    """Forget stored rankings (for one league, or all of them)"""
+    with _lock:
+        for grouping in [g for g in _rankings if league is None or g[0] == league]:
+            del _rankings[grouping]
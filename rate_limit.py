@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Per-client token-bucket rate limiting.
+
+Each client (by IP) has a bucket of ``burst`` tokens that refills at
+``rate`` tokens per second; a request takes one token and is rejected
+when the bucket is empty. Only the most recently seen ``max_clients``
+buckets are kept, so memory stays bounded however many addresses show up.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Sustained requests per second allowed per client IP; 0 disables rate limiting
+RATE_LIMIT = float(os.environ.get('RATE_LIMIT', 10))
+# Requests a client may make in a burst before being limited to RATE_LIMIT
+RATE_BURST = float(os.environ.get('RATE_BURST', 30))
+MAX_CLIENTS = 10_000
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by client"""
+
+    def __init__(self, rate=RATE_LIMIT, burst=RATE_BURST, max_clients=MAX_CLIENTS):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        # client -> [tokens, monotonic time of the last update], least recently seen first
+        self._buckets = OrderedDict()
+
+    def share(self, processes):
+        """Scale the limit down for one of `processes` servers behind SO_REUSEPORT.
+
+        The kernel spreads a client's connections evenly across them, so each
+        one enforces its share and the client still gets about rate / burst
+        overall.
+        """
+        self.rate /= processes
+        self.burst = max(self.burst / processes, 1)
+
+    def allow(self, client, cost=1, now=None):
+        """Take cost tokens from the client's bucket.
+
+        Returns 0 if the request may proceed, otherwise the seconds until
+        enough tokens are available (for Retry-After).
+        """
+        if self.rate <= 0:
+            return 0
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.pop(client, None)
+            if bucket is None:
+                bucket = [self.burst, now]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            self._buckets[client] = bucket
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0
+            return (cost - bucket[0]) / self.rate
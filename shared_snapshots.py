@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Standings snapshots shared between server processes through memory-mapped files.
+
+With PROCESSES > 1 the server forks several processes that all accept
+connections. One of them, elected by holding an flock, is the refresher:
+it scrapes, persists and publishes each league's serialized snapshot to
+``<directory>/<league>.snap``. The others never scrape; they map those
+files and serve the bodies straight from the mapping. A new snapshot is
+written to a temp file and renamed over the old one, so readers never see
+a partial write and keep serving their current mapping until they pick up
+the new file. If the refresher dies, another process takes the lock over.
+Other processes ask for a forced refresh by creating ``<league>.snap.refresh``.
+
+File layout: MAGIC, a little-endian uint32 header length, a JSON header
+(etag, last_modified, version, restored, fetched_at and the offset and
+length of each encoding), then the encoded bodies back to back.
+"""
+import fcntl
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+from standings_cache import Snapshot
+
+MAGIC = b'STANDSN1'
+HEADER = struct.Struct('<8sI')
+# Seconds between checks for new snapshots (readers) or refreshes to publish (refresher)
+SYNC_INTERVAL = 0.5
+LOCK_FILE = 'refresher.lock'
+
+
+def write(path, snapshot, fetched_at):
+    """Atomically replace path with the snapshot's encoded bodies"""
+    encodings, offset = {}, 0
+    for name, body in snapshot.encoded.items():
+        encodings[name] = [offset, len(body)]
+        offset += len(body)
+    header = json.dumps({
+        'etag': snapshot.etag,
+        'last_modified': snapshot.last_modified,
+        'version': snapshot.version,
+        'restored': snapshot.restored,
+        'fetched_at': fetched_at,
+        'encodings': encodings,
+    }).encode()
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(header)))
+            f.write(header)
+            for body in snapshot.encoded.values():
+                f.write(body)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read(path):
+    """Map path and return (Snapshot whose bodies are views of the mapping, fetched_at)"""
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, size = HEADER.unpack_from(mapping)
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not a shared snapshot')
+    header = json.loads(mapping[HEADER.size:HEADER.size + size])
+    base = HEADER.size + size
+    # The memoryviews keep the mapping alive for as long as the snapshot is served
+    view = memoryview(mapping)
+    encoded = {name: view[base + offset:base + offset + length]
+               for name, (offset, length) in header['encodings'].items()}
+    # Views, deltas and playoff odds need the parsed data; decode it once per file
+    data = json.loads(bytes(encoded['identity']))
+    snapshot = Snapshot.from_encoded(data, encoded, header['etag'], header['last_modified'], header['version'])
+    snapshot.restored = header['restored']
+    return snapshot, header['fetched_at']
+
+
+class SharedSnapshots:
+    """Publishes (refresher) or picks up (everyone else) a cache's snapshots in a directory"""
+
+    def __init__(self, directory, cache, refresh_window=0):
+        self.directory = directory
+        self.cache = cache
+        # Debounce window (seconds) for refreshes requested by other processes
+        self.refresh_window = refresh_window
+        self.refresher = False
+        # league -> (snapshot, restored, fetched_at) last written by this process
+        self._published = {}
+        # league -> (inode, mtime) of the file last installed by this process
+        self._seen = {}
+
+    def _path(self, league):
+        return os.path.join(self.directory, f'{league}.snap')
+
+    def start(self, on_elected):
+        """Start syncing; on_elected() runs in this process if it becomes the refresher"""
+        threading.Thread(target=self._elect, args=(on_elected,), daemon=True, name='refresher-election').start()
+        threading.Thread(target=self._sync_loop, daemon=True, name='snapshot-sync').start()
+
+    def request_refresh(self, league):
+        """Ask the refresher process to refresh the league (debounced on its side)"""
+        with open(self._path(league) + '.refresh', 'w'):
+            pass
+
+    def publish(self):
+        """Write leagues whose snapshot, staleness or fetch time changed; start requested refreshes"""
+        for league in self.cache.leagues():
+            try:
+                os.remove(self._path(league) + '.refresh')
+            except FileNotFoundError:
+                pass
+            else:
+                threading.Thread(target=self.cache.refresh_debounced, args=(league, self.refresh_window),
+                                 daemon=True, name=f'forced-refresh-{league}').start()
+            snapshot, age = self.cache.peek(league), self.cache.age(league)
+            if snapshot is None or age is None:
+                continue
+            fetched_at = time.time() - age
+            published = self._published.get(league)
+            if (published and published[0] is snapshot and published[1] == snapshot.restored
+                    and abs(published[2] - fetched_at) < 1):
+                continue
+            write(self._path(league), snapshot, fetched_at)
+            self._published[league] = (snapshot, snapshot.restored, fetched_at)
+
+    def sync(self):
+        """Install every league file that changed since the last sync"""
+        for league in self.cache.leagues():
+            path = self._path(league)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if self._seen.get(league) == (stat.st_ino, stat.st_mtime_ns):
+                continue
+            snapshot, fetched_at = read(path)
+            self.cache.install(league, snapshot, fetched_at)
+            self._seen[league] = (stat.st_ino, stat.st_mtime_ns)
+
+    def _sync_loop(self):
+        while True:
+            try:
+                if self.refresher:
+                    self.publish()
+                else:
+                    self.sync()
+            except Exception as e:
+                print(f"Shared snapshot sync error: {e}")
+            time.sleep(SYNC_INTERVAL)
+
+    def _elect(self, on_elected):
+        # Opened here, after the fork, so each process has its own lock
+        fd = os.open(os.path.join(self.directory, LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o600)
+        # Blocks until no other process is the refresher; the kernel drops the lock when it exits
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        self.sync()
+        self.refresher = True
+        print(f"Process {os.getpid()} elected standings refresher")
+        on_elected()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Compact deltas between two standings payloads.
+
+Standings are nested dicts whose leaves are team lists (e.g. conference ->
+AFC -> [teams]). A delta lists only the leaves that differ:
+
+    {"path": ["conference", "AFC"],
+     "teams": [<full entry for each team that was added or changed>],
+     "order": ["NE", "BUF", ...]}      # only when the order or membership moved
+
+A client rebuilds a leaf by indexing its old list by abbr, overwriting the
+listed teams and, if "order" is present, re-ordering by it.
+"""
+
+
+def _entry(team):
+    return team.to_dict() if hasattr(team, 'to_dict') else team
+
+
+def _leaves(data, path=()):
+    # Yield (path, list) for every team list in a standings payload
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from _leaves(value, path + (key,))
+    elif isinstance(data, list):
+        yield path, data
+
+
+def diff_standings(old, new):
+    """Return the list of leaf changes that turn standings old into new"""
+    old_leaves = dict(_leaves(old))
+    changes = []
+    for path, new_teams in _leaves(new):
+        old_teams = old_leaves.get(path, [])
+        if old_teams is new_teams:
+            continue
+        old_entries = {entry['abbr']: entry for entry in map(_entry, old_teams)}
+        new_entries = [_entry(team) for team in new_teams]
+
+        changed = [entry for entry in new_entries if old_entries.get(entry['abbr']) != entry]
+        order = [entry['abbr'] for entry in new_entries]
+        reordered = order != [entry['abbr'] for entry in map(_entry, old_teams)]
+        if not changed and not reordered:
+            continue
+
+        change = {'path': list(path), 'teams': changed}
+        if reordered:
+            change['order'] = order
+        changes.append(change)
+    return changes
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import deque
+
+import metrics
+from snapshot_diff import diff_standings
+from team_record import StandingsEncoder
+
+# Seconds a parsed snapshot is considered fresh before a background refresh
+STANDINGS_TTL = float(os.environ.get('STANDINGS_TTL', 300))
+# Seconds a request without any snapshot waits for an in-flight fetch
+FETCH_WAIT_TIMEOUT = 30
+# Past snapshots kept per league for ?since=<version> deltas
+HISTORY_SIZE = int(os.environ.get('STANDINGS_HISTORY', 20))
+
+CACHE_LOOKUPS = metrics.Counter('standings_cache_lookups_total',
+                                'Snapshot lookups by result: hit (fresh), stale (served while refreshing) or miss',
+                                ('league', 'result'))
+SERIALIZE_SECONDS = metrics.Histogram('standings_serialize_seconds',
+                                      'Time to serialize and compress a snapshot or a single view', ('kind',))
+
+
+def encode(body):
+    """Content-Encoding -> body bytes for every encoding we serve"""
+    return {
+        'identity': body,
+        'gzip': gzip.compress(body, mtime=0),
+        'deflate': zlib.compress(body),
+    }
+
+
+def etag_for(body):
+    return '"%s"' % hashlib.sha1(body).hexdigest()
+
+
+class Snapshot:
+    """Parsed standings with their JSON body and HTTP validators.
+
+    The body is serialized and compressed once, when the snapshot is built;
+    requests then write one of the cached buffers as-is. ``version`` is a
+    millisecond timestamp that increases with every content change and
+    names the snapshot in delta requests.
+    """
+    __slots__ = ('data', 'body', 'encoded', 'etag', 'last_modified', 'version', 'deltas', 'views', 'restored')
+
+    def __init__(self, data, last_modified=None):
+        self.data = data
+        self.body = json.dumps(data, cls=StandingsEncoder, separators=(',', ':')).encode()
+        # Content-Encoding -> body bytes; 'identity' is the raw JSON
+        self.encoded = encode(self.body)
+        self.etag = etag_for(self.body)
+        # Wall-clock time the content last changed, for Last-Modified
+        self.last_modified = time.time() if last_modified is None else last_modified
+        self.version = int(self.last_modified * 1000)
+        # Base version -> serialized delta from that version to this snapshot
+        self.deltas = {}
+        # View name -> that view on its own as a Snapshot, built on first use
+        self.views = {}
+        # True while this is a saved copy from before a restart, not yet confirmed by a live fetch
+        self.restored = False
+
+    @classmethod
+    def from_encoded(cls, data, encoded, etag, last_modified, version):
+        """Wrap bodies serialized elsewhere (e.g. another process's shared memory) without re-encoding"""
+        snapshot = cls.__new__(cls)
+        snapshot.data = data
+        snapshot.body = encoded['identity']
+        snapshot.encoded = encoded
+        snapshot.etag = etag
+        snapshot.last_modified = last_modified
+        snapshot.version = version
+        snapshot.deltas = {}
+        snapshot.views = {}
+        snapshot.restored = False
+        return snapshot
+
+    def view(self, name):
+        """Return one view of the standings (e.g. 'division') as its own pre-serialized Snapshot"""
+        view = self.views.get(name)
+        if view is None:
+            with SERIALIZE_SECONDS.time(kind='view'):
+                view = Snapshot(self.data[name], self.last_modified)
+            view.version = self.version
+            self.views[name] = view
+        return view
+
+
+class _Entry:
+    """Cached snapshot and refresh bookkeeping for one league"""
+    __slots__ = ('lock', 'changed', 'snapshot', 'history', 'ttl', 'fetched_at', 'attempted_at', 'pending')
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self.lock = threading.Lock()
+        # Notified whenever a refresh installs a snapshot with new content
+        self.changed = threading.Condition(self.lock)
+        self.snapshot = None
+        # Recent snapshots by version, oldest first, ending with the current one
+        self.history = deque(maxlen=max(history_size, 1))
+        # Per-league override of the cache TTL (see StandingsCache.set_ttl)
+        self.ttl = None
+        self.fetched_at = 0.0
+        self.attempted_at = 0.0
+        self.pending = None
+
+
+class StandingsCache:
+    """Per-league standings cache with stale-while-revalidate refreshes.
+
+    ``fetchers`` maps a league key to a callable returning parsed standings
+    (or None on failure). Fresh snapshots are returned directly; stale ones
+    are returned immediately while a single background thread refreshes
+    them. Concurrent misses share one upstream fetch.
+    """
+
+    def __init__(self, fetchers, ttl=STANDINGS_TTL, history_size=HISTORY_SIZE):
+        self.fetchers = dict(fetchers)
+        self.ttl = ttl
+        self._entries = {league: _Entry(history_size) for league in self.fetchers}
+        # Called as listener(league, snapshot) whenever a league's content changes,
+        # and when a live fetch confirms a snapshot restored at startup
+        self._listeners = []
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def prime(self, league, snapshot, saved_at=None):
+        """Install a previously saved snapshot if the league has none yet.
+
+        The snapshot is served right away but counts as stale, so the first
+        request (or the prefetcher) still refreshes it. saved_at (wall clock)
+        dates it for age(); it defaults to the snapshot's Last-Modified.
+        """
+        entry = self._entries[league]
+        with entry.lock:
+            if entry.snapshot is not None:
+                return False
+            entry.snapshot = snapshot
+            entry.history.append(snapshot)
+            # Date the snapshot by when it was saved so age() stays truthful
+            saved_at = snapshot.last_modified if saved_at is None else saved_at
+            entry.fetched_at = time.monotonic() - max(time.time() - saved_at, 0)
+            entry.changed.notify_all()
+        return True
+
+    def __contains__(self, league):
+        return league in self._entries
+
+    def leagues(self):
+        return list(self.fetchers)
+
+    def get(self, league):
+        """Return the standings for a league, fetching them if needed"""
+        snapshot = self.get_snapshot(league)
+        return snapshot.data if snapshot else None
+
+    def get_snapshot(self, league):
+        """Return the league's current Snapshot, fetching it if needed"""
+        entry = self._entries[league]
+        leader = False
+        with entry.lock:
+            snapshot = entry.snapshot
+            ttl = self.ttl if entry.ttl is None else entry.ttl
+            if snapshot is not None and time.monotonic() - entry.attempted_at < ttl:
+                CACHE_LOOKUPS.inc(league=league, result='hit')
+                return snapshot
+            done = entry.pending
+            if done is None:
+                done = entry.pending = threading.Event()
+                leader = True
+
+        CACHE_LOOKUPS.inc(league=league, result='miss' if snapshot is None else 'stale')
+        if snapshot is not None:
+            # Serve the stale snapshot; one worker refreshes it in the background
+            if leader:
+                threading.Thread(target=self._refresh, args=(league, entry, done), daemon=True).start()
+            return snapshot
+
+        # Cold miss: the first caller fetches, everyone else waits for it
+        if leader:
+            self._refresh(league, entry, done)
+        else:
+            done.wait(FETCH_WAIT_TIMEOUT)
+        return entry.snapshot
+
+    def set_ttl(self, league, ttl):
+        """Override how long the league's snapshot stays fresh (None restores the default)"""
+        self._entries[league].ttl = ttl
+
+    def refresh(self, league):
+        """Fetch the league now, or wait for a fetch already in flight; returns the current Snapshot"""
+        entry = self._entries[league]
+        with entry.lock:
+            done = entry.pending
+            leader = done is None
+            if leader:
+                done = entry.pending = threading.Event()
+        if leader:
+            self._refresh(league, entry, done)
+        else:
+            done.wait(FETCH_WAIT_TIMEOUT)
+        return entry.snapshot
+
+    def refresh_debounced(self, league, window):
+        """Refresh the league now unless it was fetched (or tried) within the last window seconds.
+
+        Lets clients force a refresh without each of them hitting upstream;
+        returns the current Snapshot.
+        """
+        entry = self._entries[league]
+        with entry.lock:
+            recent = time.monotonic() - entry.attempted_at < window
+            if entry.snapshot is not None and entry.pending is None and recent:
+                return entry.snapshot
+        return self.refresh(league)
+
+    def peek(self, league):
+        """Return the league's current Snapshot (or None) without fetching"""
+        return self._entries[league].snapshot
+
+    def wait_for_change(self, league, etag, timeout=None):
+        """Block until the league's snapshot differs from etag (or timeout); returns the current snapshot"""
+        entry = self._entries[league]
+        with entry.lock:
+            entry.changed.wait_for(
+                lambda: entry.snapshot is not None and entry.snapshot.etag != etag, timeout)
+            return entry.snapshot
+
+    def delta(self, league, since):
+        """Return the JSON delta from snapshot version since to the current one.
+
+        Returns None when there is no snapshot or since has left the history;
+        callers then send the full snapshot instead.
+        """
+        entry = self._entries[league]
+        with entry.lock:
+            current = entry.snapshot
+            base = next((s for s in entry.history if s.version == since), None)
+        if current is None or base is None:
+            return None
+        body = current.deltas.get(since)
+        if body is None:
+            changes = [] if base is current else diff_standings(base.data, current.data)
+            body = json.dumps({'version': current.version, 'since': since, 'changes': changes},
+                              separators=(',', ':')).encode()
+            current.deltas[since] = body
+        return body
+
+    def age(self, league):
+        """Seconds since the league was last fetched successfully, or None"""
+        entry = self._entries[league]
+        if entry.snapshot is None:
+            return None
+        return time.monotonic() - entry.fetched_at
+
+    def _refresh(self, league, entry, done):
+        try:
+            data = self.fetchers[league]()
+        except Exception as e:
+            print(f"{league.upper()} refresh error: {e}")
+            data = None
+
+        snapshot = None
+        if data:
+            with SERIALIZE_SECONDS.time(kind='snapshot'):
+                snapshot = Snapshot(data)
+        now = time.monotonic()
+        with entry.lock:
+            installed = self._install(entry, snapshot, now) if snapshot is not None else None
+            entry.attempted_at = now
+            entry.pending = None
+        done.set()
+        if installed is not None:
+            self._notify(league, installed)
+
+    def install(self, league, snapshot, fetched_at=None):
+        """Install a snapshot built elsewhere (e.g. by another process) as if a refresh fetched it.
+
+        fetched_at (wall clock) dates it for age(). Returns True if the content changed.
+        """
+        entry = self._entries[league]
+        now = time.monotonic()
+        if fetched_at is not None:
+            now -= max(time.time() - fetched_at, 0)
+        with entry.lock:
+            installed = self._install(entry, snapshot, now)
+            entry.attempted_at = max(entry.attempted_at, now)
+        if installed is not None:
+            self._notify(league, installed)
+        # A confirmed restored snapshot is notified too, but its content did not change
+        return installed is snapshot
+
+    def _install(self, entry, snapshot, fetched_at):
+        # Called with entry.lock held. Returns the snapshot listeners should
+        # hear about: the new one if the content changed, the kept one if this
+        # confirms a restored snapshot, otherwise None.
+        installed = None
+        # Keep the old snapshot (and its Last-Modified) if nothing changed
+        if entry.snapshot is not None and entry.snapshot.etag == snapshot.etag:
+            if entry.snapshot.restored and not snapshot.restored:
+                # Saved copies (history, last-known-good) were never written by this process
+                installed = entry.snapshot
+            entry.snapshot.restored = snapshot.restored
+        else:
+            if entry.snapshot is not None:
+                snapshot.version = max(snapshot.version, entry.snapshot.version + 1)
+            entry.snapshot = snapshot
+            entry.history.append(snapshot)
+            entry.changed.notify_all()
+            installed = snapshot
+        entry.fetched_at = fetched_at
+        return installed
+
+    def _notify(self, league, snapshot):
+        for listener in self._listeners:
+            try:
+                listener(league, snapshot)
+            except Exception as e:
+                print(f"{league.upper()} snapshot listener error: {e}")
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""Shared standings parser driven by the league configs in leagues.py.
+
+A page is read once into div lines (extract_lines), each line is classified
+once against the league's header table (tokenize), and the four view parsers
+walk that same token stream. With STREAM_PARSE=1 the lines come from
+DivLineParser as the page downloads, without building a document tree.
+"""
+import os
+import re
+import time
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup, NavigableString, CData, Tag
+
+import metrics
+import ranking
+import upstream
+from leagues import get_league
+from team_record import SeededTeam, TeamTable
+
+# Parse pages incrementally while they download instead of via BeautifulSoup
+STREAM_PARSE = os.environ.get('STREAM_PARSE', '0') == '1'
+
+PARSE_SECONDS = metrics.Histogram('standings_parse_seconds',
+                                  'Time per parse phase: tokenize, each view, and sorting',
+                                  ('league', 'phase'))
+
+
+def extract_lines(soup):
+    """Return the stripped text of each div in document order, reading every string once.
+
+    A div's line is its own text plus that of inline children (links, spans),
+    but not the text of nested divs, which get lines of their own. Wrapper divs
+    that only hold other divs produce no line.
+    """
+    lines = []
+
+    def walk(node, parts):
+        # Collect node's inline text into parts; returns True if it holds divs
+        has_divs = False
+        for child in node.children:
+            if isinstance(child, Tag):
+                if child.name == 'div':
+                    has_divs = True
+                    index = len(lines)
+                    lines.append(None)
+                    own = []
+                    nested = walk(child, own)
+                    text = ''.join(own).strip()
+                    if text or not nested:
+                        lines[index] = text
+                elif walk(child, parts):
+                    has_divs = True
+            elif type(child) in (NavigableString, CData):
+                parts.append(child)
+        return has_divs
+
+    walk(soup, [])
+    return [line for line in lines if line is not None]
+
+
+class DivLineParser(HTMLParser):
+    """Incremental extract_lines: feed() HTML chunks, and each div line is passed
+    to emit(text) in document order as soon as it is complete.
+
+    Lines match extract_lines, except that a div holding other divs emits the
+    text before its first nested div right away and any text after its nested
+    divs when it closes, instead of one joined line. Otherwise every page
+    wrapper would hold back all lines until the end of the page.
+    """
+
+    def __init__(self, emit):
+        super().__init__(convert_charrefs=True)
+        self.emit = emit
+        # One [text parts, has nested divs] pair per open div
+        self._divs = []
+        # Depth of <script>/<style>, whose text is not page content
+        self._raw = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'div':
+            if self._divs and not self._divs[-1][1]:
+                parent = self._divs[-1]
+                parent[1] = True
+                self._emit_text(parent[0])
+                parent[0] = []
+            self._divs.append([[], False])
+        elif tag in ('script', 'style'):
+            self._raw += 1
+
+    def handle_endtag(self, tag):
+        if tag == 'div' and self._divs:
+            self._close_div()
+        elif tag in ('script', 'style') and self._raw:
+            self._raw -= 1
+
+    def handle_data(self, data):
+        if self._divs and not self._raw:
+            self._divs[-1][0].append(data)
+
+    def unknown_decl(self, data):
+        if data.startswith('CDATA['):
+            self.handle_data(data[6:])
+
+    def close(self):
+        super().close()
+        while self._divs:
+            self._close_div()
+
+    def _close_div(self):
+        parts, nested = self._divs.pop()
+        if nested:
+            self._emit_text(parts)
+        else:
+            self.emit(''.join(parts).strip())
+
+    def _emit_text(self, parts):
+        text = ''.join(parts).strip()
+        if text:
+            self.emit(text)
+
+
+class LineClassifier:
+    """Precompiled line patterns and O(1) header lookup for one league.
+
+    Headers are found with a single dict lookup on the text before the first
+    ':'. Team, seed and eliminated lines each use one compiled pattern matched
+    at the start of the line, so most non-matching lines fail on their first
+    character or two; group lines keep their original unanchored search.
+    """
+
+    def __init__(self, league):
+        self.headers = league['headers']
+        columns = r'\s+(\d+)' * len(league['record'])
+        self.team = re.compile(r'([A-Z]{2,3})(?:-[a-z])?' + columns).match
+        self.seed = re.compile(r'(\d+):([A-Z]{2,3})' + columns).match
+        self.eliminated = re.compile(r'([A-Z]{2,3})-e' + columns).match
+        self.group = re.compile(r'\d+:\[?([A-Z]{2,3})\]?.*?(\d+)-(\d+)').search
+
+    def header(self, text):
+        return self.headers.get(text.partition(':')[0])
+
+
+# id(league config) -> (config, LineClassifier); the config is kept so ids stay unique
+_classifiers = {}
+
+
+def classifier_for(league):
+    """Return the (cached) LineClassifier for a league config"""
+    cached = _classifiers.get(id(league))
+    if cached is None or cached[0] is not league:
+        cached = _classifiers[id(league)] = (league, LineClassifier(league))
+    return cached[1]
+
+
+def tokenize(league, soup):
+    """Classify each div line once via the league's header table: returns (header, text) pairs"""
+    header = classifier_for(league).header
+    return [(header(text), text) for text in extract_lines(soup)]
+
+
+def _tokens(league, source):
+    # Views accept a soup directly as well as a pre-built token stream
+    return tokenize(league, source) if isinstance(source, Tag) else source
+
+
+def _is_footer(league, text):
+    prefix = league.get('footer_prefix')
+    marker = league.get('footer_marker')
+    return bool((prefix and text.startswith(prefix)) or (marker and marker in text))
+
+
+def team_table(league, records=None):
+    """Return records, or a fresh TeamTable for the league when it is None"""
+    return TeamTable(league['teams']) if records is None else records
+
+
+def parse_team_line(league, text, records=None):
+    """Parse a team line ("ABBR  W  L [T]") and return its TeamRecord"""
+    match = classifier_for(league).team(text)
+    if match:
+        return team_table(league, records).record(match.group(1), match.groups()[1:])
+    return None
+
+
+def parse_group_line(league, text, records=None):
+    """Parse an NBA Cup style group line ("1:ABBR ... W-L") and return its TeamRecord"""
+    match = classifier_for(league).group(text)
+    if match:
+        return team_table(league, records).record(match.group(1), match.groups()[1:])
+    return None
+
+
+def _line_parser(kind):
+    return parse_group_line if kind == 'group' else parse_team_line
+
+
+def parse_division_view(league, source, records=None):
+    """Parse division standings"""
+    records = team_table(league, records)
+    rules = league['division_view']
+    parse_line = _line_parser(rules['line'])
+    size = rules.get('size')
+    divisions = {conf: {div: [] for div in divs} for conf, divs in league['divisions'].items()}
+    seen = {}
+
+    current_conference = None
+    current_division = None
+    in_section = False
+
+    for header, text in _tokens(league, source):
+        # Detect division headers
+        if header and header[0] == rules['header']:
+            current_conference, current_division, in_section = header[1], header[2], True
+            continue
+        elif (rules.get('end_on_blank') and text == '') or (rules.get('end_on_footer') and _is_footer(league, text)):
+            in_section = False
+            continue
+
+        if in_section and current_conference and current_division:
+            team_data = parse_line(league, text, records)
+            if team_data:
+                teams = divisions[current_conference][current_division]
+                scope = current_conference if rules['unique_per'] == 'conference' else (current_conference, current_division)
+                abbrs = seen.setdefault(scope, set())
+                # Only add if the division has room and the team is not a duplicate
+                if (size is None or len(teams) < size) and team_data.abbr not in abbrs:
+                    teams.append(team_data)
+                    abbrs.add(team_data.abbr)
+
+    return divisions
+
+
+def parse_conference_view(league, source, records=None):
+    """Parse conference standings (all teams in each conference)"""
+    records = team_table(league, records)
+    rules = league['conference_view']
+    parse_line = _line_parser(rules['line'])
+    size = rules.get('size')
+    conferences = {conf: [] for conf in league['conferences']}
+    seen = {conf: set() for conf in league['conferences']}
+
+    current_conference = None
+    in_section = False
+
+    for header, text in _tokens(league, source):
+        kind = header[0] if header else None
+        if kind in rules['start']:
+            current_conference = header[1]
+            in_section = True
+            continue
+        elif kind in rules['end'] or (rules.get('end_on_footer') and _is_footer(league, text)):
+            in_section = False
+            current_conference = None
+            continue
+
+        if in_section and current_conference:
+            team_data = parse_line(league, text, records)
+            if team_data:
+                abbr = team_data.abbr
+                if abbr not in seen[current_conference] and (size is None or len(conferences[current_conference]) < size):
+                    conferences[current_conference].append(team_data)
+                    seen[current_conference].add(abbr)
+
+    return conferences
+
+
+def parse_league_view(league, source, records=None):
+    """Parse league standings (every team, as listed on the page)"""
+    records = team_table(league, records)
+    rules = league['league_view']
+    all_teams = []
+    all_abbrs = set()
+    in_league_section = False
+
+    for header, text in _tokens(league, source):
+        kind = header[0] if header else None
+        if kind in rules['start']:
+            in_league_section = True
+            continue
+        elif kind in rules['end']:
+            in_league_section = False
+            continue
+
+        if in_league_section:
+            team_data = parse_team_line(league, text, records)
+            if team_data and team_data.abbr not in all_abbrs:
+                all_teams.append(team_data)
+                all_abbrs.add(team_data.abbr)
+
+    return all_teams
+
+
+def parse_playoffs_view(league, source, records=None):
+    """Parse playoff picture"""
+    records = team_table(league, records)
+    rules = league['playoffs_view']
+    classifier = classifier_for(league)
+    playoffs = {conf: {'division_leaders': [], 'wild_card': [], 'eliminated': []} for conf in league['conferences']}
+    seen = {conf: {'division_leaders': set(), 'wild_card': set(), 'eliminated': set()} for conf in league['conferences']}
+
+    current_conference = None
+
+    for header, text in _tokens(league, source):
+        if header and header[0] in rules['conference']:
+            current_conference = header[1]
+
+        # Seeded team (e.g., "1:NE  10  2  0"); seeds up to leaders_max_seed lead their divisions
+        seed_match = classifier.seed(text)
+        if seed_match:
+            seed = int(seed_match.group(1))
+            abbr = seed_match.group(2)
+            target_section = 'division_leaders' if seed <= rules['leaders_max_seed'] else 'wild_card'
+            team_data = SeededTeam(seed, records.record(abbr, seed_match.groups()[2:]))
+        else:
+            # Eliminated teams are marked with -e and have no seed
+            eliminated_match = classifier.eliminated(text)
+            if not eliminated_match:
+                continue
+            abbr = eliminated_match.group(1)
+            target_section = 'eliminated'
+            team_data = records.record(abbr, eliminated_match.groups()[1:])
+
+        if current_conference in playoffs and abbr not in seen[current_conference][target_section]:
+            playoffs[current_conference][target_section].append(team_data)
+            seen[current_conference][target_section].add(abbr)
+
+    return playoffs
+
+
+def parse_standings(key, html):
+    """Parse a raw standings page into division, conference, league and playoff views"""
+    with PARSE_SECONDS.time(league=key, phase='tokenize'):
+        soup = BeautifulSoup(html, 'html.parser')
+        # Extract and classify every line once, then parse all views from it
+        tokens = tokenize(get_league(key), soup)
+    return parse_tokens(key, tokens)
+
+
+def parse_tokens(key, tokens):
+    """Parse a page's token stream into division, conference, league and playoff views"""
+    league = get_league(key)
+    # The views share one TeamRecord per team and record
+    records = TeamTable(league['teams'])
+    sorted_views = league.get('sorted_views', ())
+    sort_seconds = 0.0
+
+    def rank(grouping, teams):
+        nonlocal sort_seconds
+        start = time.perf_counter()
+        ranked = ranking.rank(grouping, teams)
+        sort_seconds += time.perf_counter() - start
+        return ranked
+
+    with PARSE_SECONDS.time(league=key, phase='division'):
+        division_data = parse_division_view(league, tokens, records)
+    with PARSE_SECONDS.time(league=key, phase='conference'):
+        conference_data = parse_conference_view(league, tokens, records)
+    if 'conference' in sorted_views:
+        for conf in conference_data:
+            conference_data[conf] = rank((key, 'conference', conf), conference_data[conf])
+
+    if league.get('sync_divisions'):
+        # Point division entries at the conference view's records
+        conf_lookup = {t.abbr: t for teams in conference_data.values() for t in teams}
+        for divisions in division_data.values():
+            for div, teams in divisions.items():
+                divisions[div] = [conf_lookup.get(team.abbr, team) for team in teams]
+    if 'division' in sorted_views:
+        for conf, divisions in division_data.items():
+            for div in divisions:
+                divisions[div] = rank((key, 'division', conf, div), divisions[div])
+
+    with PARSE_SECONDS.time(league=key, phase='league'):
+        if league['league_view'].get('from_conferences'):
+            # Build league data from conference data (all teams, flat list, unique)
+            league_data = []
+            seen = set()
+            for teams in conference_data.values():
+                for team in teams:
+                    if team.abbr not in seen:
+                        league_data.append(team)
+                        seen.add(team.abbr)
+        else:
+            league_data = parse_league_view(league, tokens, records)
+    if 'league' in sorted_views:
+        league_data = rank((key, 'league'), league_data)
+
+    with PARSE_SECONDS.time(league=key, phase='playoffs'):
+        playoffs_data = parse_playoffs_view(league, tokens, records)
+    PARSE_SECONDS.observe(sort_seconds, league=key, phase='sort')
+    return {
+        'division': division_data,
+        'conference': conference_data,
+        'league': league_data,
+        'playoffs': playoffs_data
+    }
+
+
+
+def season_records(key, data):
+    """Conference -> each team's season record entry, from the league's season_records view.
+
+    Works on parsed standings and on their JSON form alike.
+    """
+    if get_league(key).get('season_records') != 'playoffs':
+        return {conf: list(teams) for conf, teams in data.get('conference', {}).items()}
+    conferences = {}
+    for conf, sections in data.get('playoffs', {}).items():
+        teams, seen = [], set()
+        for section in sections.values():
+            for team in section:
+                if team.get('abbr') not in seen:
+                    teams.append(team)
+                    seen.add(team.get('abbr'))
+        conferences[conf] = teams
+    return conferences
+
+# url -> tokens of the last page streamed from it, reused when upstream answers 304
+_streamed_tokens = {}
+
+
+def stream_tokens(key, url):
+    """Download and tokenize a league's page in one pass, chunk by chunk"""
+    classify = classifier_for(get_league(key)).header
+    tokens = []
+    parser = DivLineParser(lambda text: tokens.append((classify(text), text)))
+    if not upstream.stream_html(key, url, parser.feed, conditional=url in _streamed_tokens):
+        return _streamed_tokens[url]
+    parser.close()
+    _streamed_tokens[url] = tokens
+    return tokens
+
+
+def fetch_standings(key, executor=None):
+    """Fetch and parse a league's standings page; returns None on failure.
+
+    With an executor (e.g. a ProcessPoolExecutor) the parse runs there while
+    the fetch stays on the calling thread. In STREAM_PARSE mode the page is
+    parsed on the calling thread as it arrives, and executor is not used.
+    """
+    league = get_league(key)
+    url = league['url']
+
+    try:
+        print(f"Fetching {league['name']} from {url}...")
+        if STREAM_PARSE:
+            tokens = stream_tokens(key, url)
+            print(f"{league['name']} data fetched successfully")
+            return parse_tokens(key, tokens)
+        html = upstream.fetch_html(key, url)
+        print(f"{league['name']} data fetched successfully")
+        if executor is not None:
+            return executor.submit(parse_standings, key, html).result()
+        return parse_standings(key, html)
+
+    except Exception as e:
+        print(f"Error fetching {league['name']} standings: {e}")
+        return None
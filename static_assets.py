@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""In-memory static assets with content-hashed URLs and precompressed bodies.
+
+The front-end files are read once at startup. Scripts and stylesheets are
+also served under a fingerprinted name (``styles.<hash>.css``) with
+``Cache-Control: immutable``, and the HTML pages have their references
+rewritten to those names, so browsers only revalidate the small HTML page.
+Every body is gzipped up front. With STATIC_DEV=1 the files are re-read
+whenever they change on disk, so edits show up on the next reload.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Served from memory; everything else falls through to the file handler
+STATIC_FILES = ('combined_index.html', 'combined_script.js', 'script.js', 'styles.css')
+# Re-read changed files on request instead of serving the startup copies
+STATIC_DEV = os.environ.get('STATIC_DEV', '0') == '1'
+# Fingerprinted URLs never change content, so browsers may keep them for a year
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Pages are revalidated every time (cheaply, via ETag)
+REVALIDATE = 'no-cache'
+
+REFERENCE = re.compile(r'''(\b(?:src|href)=["'])([^"'#?]+)(["'])''')
+
+
+class Asset:
+    """One servable body: identity and gzip encodings plus caching headers"""
+    __slots__ = ('content_type', 'encoded', 'etag', 'cache_control')
+
+    def __init__(self, body, content_type, cache_control):
+        self.content_type = content_type
+        self.encoded = {'identity': body}
+        compressed = gzip.compress(body, 9, mtime=0)
+        # Tiny files can grow when compressed
+        if len(compressed) < len(body):
+            self.encoded['gzip'] = compressed
+        self.etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        self.cache_control = cache_control
+
+
+def fingerprint(name, body):
+    """styles.css -> styles.<first 10 hex digits of its sha256>.css"""
+    stem, ext = os.path.splitext(name)
+    return f'{stem}.{hashlib.sha256(body).hexdigest()[:10]}{ext}'
+
+
+def _content_type(name):
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type.endswith('javascript'):
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+class StaticAssets:
+    """URL path -> Asset table for a fixed set of files under root"""
+
+    def __init__(self, root=ROOT, files=STATIC_FILES, dev=STATIC_DEV):
+        self.root = root
+        self.files = tuple(files)
+        self.dev = dev
+        self._lock = threading.Lock()
+        self._mtimes = None
+        self._assets = {}
+        self.urls = {}
+        self.load()
+
+    def _stat(self):
+        mtimes = {}
+        for name in self.files:
+            try:
+                mtimes[name] = os.stat(os.path.join(self.root, name)).st_mtime_ns
+            except FileNotFoundError:
+                mtimes[name] = None
+        return mtimes
+
+    def load(self):
+        """(Re)read every file and rebuild the URL table"""
+        mtimes = self._stat()
+        bodies = {}
+        for name in self.files:
+            if mtimes[name] is None:
+                print(f"Static asset {name} not found, skipping")
+                continue
+            with open(os.path.join(self.root, name), 'rb') as f:
+                bodies[name] = f.read()
+        # Fingerprint everything except the HTML pages, whose URLs people bookmark
+        urls = {name: fingerprint(name, body) for name, body in bodies.items()
+                if not name.endswith('.html')}
+        assets = {}
+        for name, body in bodies.items():
+            if name in urls:
+                assets['/' + urls[name]] = Asset(body, _content_type(name), IMMUTABLE)
+            else:
+                body = self.rewrite(body, urls)
+            # The plain name stays available for old pages and bookmarks
+            assets['/' + name] = Asset(body, _content_type(name), REVALIDATE)
+        with self._lock:
+            self._assets, self.urls, self._mtimes = assets, urls, mtimes
+
+    @staticmethod
+    def rewrite(html, urls):
+        """Point src/href references at the fingerprinted names"""
+        def replace(match):
+            prefix, target, quote = match.groups()
+            name = target.lstrip('./')
+            return prefix + urls[name] + quote if name in urls else match.group(0)
+        return REFERENCE.sub(replace, html.decode('utf-8')).encode('utf-8')
+
+    def get(self, path):
+        """The Asset served at path, or None"""
+        if self.dev and self._stat() != self._mtimes:
+            print('Static assets changed on disk, reloading')
+            self.load()
+        return self._assets.get(path)
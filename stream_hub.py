@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Server-Sent Events fan-out for live standings.
+
+Handlers write the SSE response headers and the current snapshot, then hand
+their socket to the hub and return, so a subscriber does not hold a request
+worker. One thread per league waits for the cache to report new content
+and writes a single pre-built event to every subscriber. While it waits it
+sends keep-alive comments and nudges the cache, so stale standings are
+refreshed once per TTL however many viewers are connected.
+"""
+import os
+import socket
+import threading
+
+# Seconds between keep-alive comments on idle streams
+STREAM_KEEPALIVE = float(os.environ.get('STREAM_KEEPALIVE', 15))
+# Seconds a subscriber may block a write before it is dropped
+SEND_TIMEOUT = 2
+# Client reconnect delay advertised to EventSource, in milliseconds
+RETRY_MS = 5000
+
+
+def format_event(snapshot):
+    """Encode a snapshot as one SSE 'standings' event (the JSON body is a single line).
+
+    The event id is the snapshot version, so clients can ask for ?since= deltas later.
+    """
+    return b'id: ' + str(snapshot.version).encode() + b'\nevent: standings\ndata: ' + snapshot.body + b'\n\n'
+
+
+class StreamHub:
+    """Tracks SSE subscribers per league and pushes them snapshot changes"""
+
+    def __init__(self, cache, keepalive=STREAM_KEEPALIVE):
+        self.cache = cache
+        self.keepalive = keepalive
+        self._lock = threading.Lock()
+        # league -> {socket: lock serializing writes to that socket}
+        self._subscribers = {}
+        self._threads = {}
+
+    def subscriber_count(self, league=None):
+        with self._lock:
+            if league is not None:
+                return len(self._subscribers.get(league, ()))
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def subscribe(self, league, sock, last_event_id=None):
+        """Take ownership of a connected socket that has been sent the SSE headers.
+
+        The current snapshot is sent right away unless the client already
+        has it (its Last-Event-ID matches the snapshot's version).
+        """
+        sock.settimeout(SEND_TIMEOUT)
+        write_lock = threading.Lock()
+        # Held through the first event, so a broadcast can neither interleave
+        # with it nor overtake it with a newer snapshot
+        with write_lock:
+            with self._lock:
+                self._subscribers.setdefault(league, {})[sock] = write_lock
+                if league not in self._threads:
+                    thread = threading.Thread(target=self._run, args=(league,), daemon=True,
+                                              name=f'sse-{league}')
+                    self._threads[league] = thread
+                    thread.start()
+            # Registered first, so a change from here on is broadcast to this socket too
+            snapshot = self.cache.peek(league)
+            ok = True
+            if snapshot is not None and str(snapshot.version) != last_event_id:
+                ok = self._write(sock, format_event(snapshot))
+        if not ok:
+            self._drop(league, [sock])
+
+    def _run(self, league):
+        snapshot = self.cache.peek(league)
+        etag = snapshot.etag if snapshot else None
+        while True:
+            snapshot = self.cache.wait_for_change(league, etag, self.keepalive)
+            if snapshot is not None and snapshot.etag != etag:
+                etag = snapshot.etag
+                self._broadcast(league, format_event(snapshot))
+            elif self.subscriber_count(league):
+                self._broadcast(league, b': keepalive\n\n')
+                # Serves the cached copy; kicks off one background refresh when stale
+                self.cache.get_snapshot(league)
+
+    def _broadcast(self, league, payload):
+        with self._lock:
+            subscribers = list(self._subscribers.get(league, {}).items())
+        dropped = []
+        for sock, write_lock in subscribers:
+            with write_lock:
+                if not self._write(sock, payload):
+                    dropped.append(sock)
+        if dropped:
+            self._drop(league, dropped)
+
+    @staticmethod
+    def _write(sock, payload):
+        # Returns False if the subscriber is gone or too slow
+        try:
+            sock.sendall(payload)
+            return True
+        except OSError:
+            return False
+
+    def _drop(self, league, dropped):
+        with self._lock:
+            subscribers = self._subscribers.get(league, {})
+            for sock in dropped:
+                subscribers.pop(sock, None)
+        for sock in dropped:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
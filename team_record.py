@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Compact team records shared by every standings view.
+
+A parse creates one TeamTable; each distinct (team, record) seen on the page
+becomes a single TeamRecord that the division, conference, league and playoff
+views all reference. StandingsEncoder turns them back into the JSON objects
+the frontend expects.
+"""
+import json
+
+
+class TeamRecord:
+    """One team's record; ties is None for leagues without ties"""
+    __slots__ = ('name', 'abbr', 'wins', 'losses', 'ties', 'sort_key')
+
+    def __init__(self, name, abbr, wins, losses, ties=None):
+        self.name = name
+        self.abbr = abbr
+        self.wins = wins
+        self.losses = losses
+        self.ties = ties
+        # Standings order: wins (desc), losses (asc), ties (desc), then team name
+        self.sort_key = (-wins, losses, -(ties or 0), name)
+
+    def __repr__(self):
+        return f'TeamRecord({self.abbr} {self.wins}-{self.losses}' + ('' if self.ties is None else f'-{self.ties}') + ')'
+
+    # Mapping-style access for callers written against the old team dicts
+    def __getitem__(self, key):
+        if key not in self.__slots__ or key == 'sort_key' or (key == 'ties' and self.ties is None):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        data = {'name': self.name, 'abbr': self.abbr, 'wins': self.wins, 'losses': self.losses}
+        if self.ties is not None:
+            data['ties'] = self.ties
+        return data
+
+
+class SeededTeam:
+    """A playoff entry: a seed plus a reference to the team's shared record"""
+    __slots__ = ('seed', 'record')
+
+    def __init__(self, seed, record):
+        self.seed = seed
+        self.record = record
+
+    def __getattr__(self, name):
+        # Only reached for names SeededTeam lacks; guard 'record' so unpickling
+        # (which looks attributes up before the slots are set) cannot recurse
+        if name == 'record':
+            raise AttributeError(name)
+        return getattr(self.record, name)
+
+    def __getitem__(self, key):
+        return self.seed if key == 'seed' else self.record[key]
+
+    def get(self, key, default=None):
+        return self.seed if key == 'seed' else self.record.get(key, default)
+
+    def to_dict(self):
+        data = {'seed': self.seed}
+        data.update(self.record.to_dict())
+        return data
+
+
+class TeamTable:
+    """Interns TeamRecords for one parse: one object per team and record"""
+
+    def __init__(self, names):
+        self.names = names
+        self._records = {}
+
+    def record(self, abbr, values):
+        """Return the shared record for abbr with the given W, L[, T] column strings"""
+        key = (abbr, values)
+        record = self._records.get(key)
+        if record is None:
+            record = self._records[key] = TeamRecord(self.names.get(abbr, abbr), abbr, *map(int, values))
+        return record
+
+    def __len__(self):
+        return len(self._records)
+
+
+class StandingsEncoder(json.JSONEncoder):
+    """JSON encoder for standings containing TeamRecord / SeededTeam entries"""
+
+    def default(self, o):
+        if isinstance(o, (TeamRecord, SeededTeam)):
+            return o.to_dict()
+        return super().default(o)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer
+import os
+import signal
+import sys
+import threading
+import time
+
+
+class DetachableMixin:
+    """Lets a handler keep its connection open after the request finishes.
+
+    A handler calls ``server.detach_request(self.connection)``; the server
+    then skips closing that socket and its new owner (e.g. the SSE hub)
+    becomes responsible for it.
+    """
+
+    def detach_request(self, request):
+        with self._detached_lock:
+            self._detached.add(request)
+
+    def shutdown_request(self, request):
+        with self._detached_lock:
+            if request in self._detached:
+                self._detached.discard(request)
+                return
+        super().shutdown_request(request)
+
+
+class StreamingHTTPServer(DetachableMixin, HTTPServer):
+    """Single-threaded HTTPServer that supports detached connections"""
+
+    def __init__(self, *args, **kwargs):
+        self._detached = set()
+        self._detached_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+
+class PooledHTTPServer(DetachableMixin, HTTPServer):
+    """HTTPServer that handles each connection on a bounded thread pool.
+
+    At most ``workers`` requests are in progress at once; further connections
+    wait in the listen backlog instead of spawning unbounded threads, so a
+    slow upstream scrape only ties up one worker.
+    """
+    request_queue_size = 128
+
+    def __init__(self, server_address, RequestHandlerClass, workers=16, bind_and_activate=True):
+        self.workers = workers
+        self._detached = set()
+        self._detached_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(workers)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='http-worker')
+        super().__init__(server_address, RequestHandlerClass, bind_and_activate)
+
+    def process_request(self, request, client_address):
+        # Block the accept loop once every worker is busy
+        self._slots.acquire()
+        try:
+            self._pool.submit(self._process_request_worker, request, client_address)
+        except RuntimeError:
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+
+def make_server(address, handler, workers, reuse_port=False):
+    """Return a pooled server, or a single-threaded one when workers is 0.
+
+    reuse_port binds with SO_REUSEPORT so several processes can listen on
+    the same port and the kernel spreads connections across them.
+    """
+    if workers > 0:
+        server = PooledHTTPServer(address, handler, workers, bind_and_activate=False)
+    else:
+        server = StreamingHTTPServer(address, handler, bind_and_activate=False)
+    server.allow_reuse_port = reuse_port
+    try:
+        server.server_bind()
+        server.server_activate()
+    except BaseException:
+        server.server_close()
+        raise
+    return server
+
+
+def prefork(processes, child):
+    """Run child() in `processes` forked processes, restarting any that exit.
+
+    Returns in the parent once it is told to stop (SIGTERM/SIGINT), after
+    stopping the children; child processes exit when child() returns.
+    """
+    children = set()
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 0
+            try:
+                child()
+            except BaseException as e:
+                print(f"Worker {os.getpid()} failed: {e!r}")
+                code = 1
+            finally:
+                sys.stdout.flush()
+                os._exit(code)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(processes):
+        spawn()
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            print(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, restarting")
+            # Avoid a fork loop when workers die right away
+            time.sleep(1)
+            if not stopping:
+                spawn()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Shared HTTP access to plaintextsports.com for the standings scrapers.
+
+All scrapers fetch through one pooled keep-alive session with bounded
+exponential-backoff retries. Requests are conditional (If-None-Match /
+If-Modified-Since), so an unchanged page costs a 304. Every distinct page
+body is also written to SNAPSHOT_DIR/<league>/<timestamp>-<digest>.html
+(the newest SNAPSHOT_KEEP per league) so it can be reparsed offline or
+replayed by the benchmarks. stream_html hands the body to a parser chunk by
+chunk as it downloads instead of buffering it.
+"""
+import codecs
+import glob
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+
+REQUEST_TIMEOUT = 10
+# Up to RETRIES retries, sleeping BACKOFF_FACTOR * 2**n seconds (capped at BACKOFF_MAX)
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+BACKOFF_MAX = 8
+# Bytes read per chunk when streaming a page
+CHUNK_SIZE = 16 * 1024
+# Where raw pages are kept; set SNAPSHOT_DIR to an empty string to disable
+SNAPSHOT_DIR = os.environ.get(
+    'SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots'))
+# Newest raw pages kept per league; older ones are deleted (0 keeps every page)
+SNAPSHOT_KEEP = int(os.environ.get('SNAPSHOT_KEEP', 500))
+# Seconds after which a temp file left in a snapshot directory (e.g. by a crash
+# before its rename) is deleted; in-flight writes touch theirs far more often
+STALE_TEMP_AGE = 3600
+
+
+def _make_session():
+    session = requests.Session()
+    retry = Retry(
+        total=RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        backoff_max=BACKOFF_MAX,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = 'nfl-nba-standings/1.0'
+    return session
+
+
+session = _make_session()
+
+FETCH_SECONDS = metrics.Histogram('standings_upstream_fetch_seconds',
+                                  'Upstream page fetch latency (streamed fetches include parsing)',
+                                  ('league', 'status'))
+FETCH_BYTES = metrics.Counter('standings_upstream_bytes_total', 'Page bytes received from upstream', ('league',))
+
+# url -> (etag, last_modified, text) of the last 200 response
+_validators = {}
+_validators_lock = threading.Lock()
+# url -> (etag, last_modified) of the last page streamed completely
+_stream_validators = {}
+# league -> digest of the newest stored page
+_saved_digests = {}
+
+
+def fetch_html(league, url):
+    """Return the page at url, revalidating against the last copy we saw.
+
+    Raises requests.RequestException when the page cannot be fetched.
+    """
+    with _validators_lock:
+        cached = _validators.get(url)
+    headers = {}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+    start = time.perf_counter()
+    try:
+        response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException:
+        FETCH_SECONDS.observe(time.perf_counter() - start, league=league, status='error')
+        raise
+    FETCH_SECONDS.observe(time.perf_counter() - start, league=league, status=response.status_code)
+    FETCH_BYTES.inc(len(response.content), league=league)
+    if response.status_code == 304 and cached:
+        return cached[2]
+    response.raise_for_status()
+
+    text = response.text
+    with _validators_lock:
+        _validators[url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'), text)
+    save_snapshot(league, text)
+    return text
+
+
+def stream_html(league, url, feed, chunk_size=CHUNK_SIZE, conditional=True):
+    """Decode the page at url chunk by chunk as it downloads, passing each piece to feed(text).
+
+    Returns False, without feeding anything, when a conditional request is
+    answered 304 (the last streamed copy is current), True otherwise. Raises
+    requests.RequestException when the page cannot be fetched.
+    """
+    with _validators_lock:
+        cached = _stream_validators.get(url) if conditional else None
+    headers = {}
+    if cached:
+        etag, last_modified = cached
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+    start = time.perf_counter()
+    status = 'error'
+    try:
+        with session.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            status = response.status_code
+            if response.status_code == 304 and cached:
+                return False
+            response.raise_for_status()
+            _stream_body(league, url, response, feed, chunk_size)
+    finally:
+        FETCH_SECONDS.observe(time.perf_counter() - start, league=league, status=status)
+    return True
+
+
+def _stream_body(league, url, response, feed, chunk_size):
+    # Decode, spool and feed the body of a streamed 200 response
+    decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+    writer = _SnapshotWriter(league)
+    try:
+        for chunk in response.iter_content(chunk_size):
+            FETCH_BYTES.inc(len(chunk), league=league)
+            text = decoder.decode(chunk)
+            if text:
+                writer.write(text)
+                feed(text)
+        text = decoder.decode(b'', final=True)
+        if text:
+            writer.write(text)
+            feed(text)
+    except BaseException:
+        writer.discard()
+        raise
+    writer.commit()
+
+    with _validators_lock:
+        _stream_validators[url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+
+def snapshot_paths(league):
+    """Stored raw pages for a league, oldest first"""
+    if not SNAPSHOT_DIR:
+        return []
+    return sorted(glob.glob(os.path.join(SNAPSHOT_DIR, league, '*.html')))
+
+
+def latest_snapshot(league):
+    """Path of the newest stored page for a league, or None"""
+    paths = snapshot_paths(league)
+    return paths[-1] if paths else None
+
+
+def load_snapshot(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def _claim_digest(league, digest):
+    # True if digest differs from the newest stored page (and is now recorded as it)
+    with _validators_lock:
+        if league not in _saved_digests:
+            latest = latest_snapshot(league)
+            if latest:
+                _saved_digests[league] = hashlib.sha1(load_snapshot(latest).encode('utf-8')).digest()
+        if _saved_digests.get(league) == digest:
+            return False
+        _saved_digests[league] = digest
+        return True
+
+
+def _snapshot_path(league, digest):
+    # <UTC time to the microsecond>-<digest prefix>.html: sorts by time, and two
+    # distinct pages never share a name even when saved in the same instant
+    directory = os.path.join(SNAPSHOT_DIR, league)
+    os.makedirs(directory, exist_ok=True)
+    now = time.time()
+    stamp = time.strftime('%Y%m%dT%H%M%S', time.gmtime(now)) + f'.{int(now % 1 * 1e6):06d}Z'
+    return os.path.join(directory, f'{stamp}-{digest.hex()[:8]}.html')
+
+
+def _prune_snapshots(league):
+    # Delete the oldest pages beyond SNAPSHOT_KEEP and temp files abandoned mid-write
+    stale = []
+    if SNAPSHOT_KEEP > 0:
+        stale += snapshot_paths(league)[:-SNAPSHOT_KEEP]
+    cutoff = time.time() - STALE_TEMP_AGE
+    for path in glob.glob(os.path.join(SNAPSHOT_DIR, league, '*.tmp')):
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                stale.append(path)
+        except FileNotFoundError:
+            pass
+    for path in stale:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def save_snapshot(league, text):
+    """Store a raw page unless it matches the newest stored one; returns the new path"""
+    if not SNAPSHOT_DIR:
+        return None
+    digest = hashlib.sha1(text.encode('utf-8')).digest()
+    if not _claim_digest(league, digest):
+        return None
+
+    path = _snapshot_path(league, digest)
+    # Write then rename so readers never see a partial page
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    _prune_snapshots(league)
+    return path
+
+
+class _SnapshotWriter:
+    """save_snapshot for a page that arrives in pieces: spools to a temp file, then renames"""
+
+    def __init__(self, league):
+        self.league = league
+        self.digest = hashlib.sha1()
+        self.file = None
+        if SNAPSHOT_DIR:
+            directory = os.path.join(SNAPSHOT_DIR, league)
+            os.makedirs(directory, exist_ok=True)
+            self.file = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory,
+                                                    suffix='.tmp', delete=False)
+
+    def write(self, text):
+        if self.file:
+            self.digest.update(text.encode('utf-8'))
+            self.file.write(text)
+
+    def discard(self):
+        if self.file:
+            self.file.close()
+            os.remove(self.file.name)
+            self.file = None
+
+    def commit(self):
+        """Keep the page unless it matches the newest stored one; returns the new path"""
+        if not self.file:
+            return None
+        self.file.close()
+        if not _claim_digest(self.league, self.digest.digest()):
+            os.remove(self.file.name)
+            return None
+        path = _snapshot_path(self.league, self.digest.digest())
+        os.replace(self.file.name, path)
+        _prune_snapshots(self.league)
+        return path